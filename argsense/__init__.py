@@ -11,14 +11,14 @@ d88P     888 888    "Y899888i  "Y8888P"   "Y8888  888  888  88888P'  "Y8888
                    Y8b    d8P
                     "Y8888P"
 """
-if 1:
-    import lk_logger
-    lk_logger.setup(quiet=True)
-
+# note: lk_logger and rich are not imported here, they are deferred until -
+# argsense is going to print something or dispatch a command. see -
+# `./console.py`.
 from . import config
 from . import converter
 from . import parser
 from .api import run_func
+from .api import run_func_async
 from .cli import CommandLineInterface
 from .cli import cli
 from .converter import args_2_cargs
@@ -28,5 +28,8 @@ from .parser import parse_argstring
 from .parser import parse_argv
 from .parser import parse_docstring
 from .parser import parse_function
+from .streams import Chunks
+from .streams import Lines
+from .streams import Mapped
 
 __version__ = '1.1.1'
@@ -20,6 +20,8 @@ def cli() -> None:
             `*args` and `**kwargs` will be passed to this function.
     """
     if len(sys.argv) == 1 or (len(sys.argv) == 2 and sys.argv[1] == '-h'):
+        from .console import setup
+        setup()
         print(
             '''
             ## Argsense CLI Usage
@@ -86,42 +88,85 @@ def _run() -> None:
 
 
 def _execfile(target: str, *c_args: str) -> None:
-    subcli = CommandLineInterface('argsense-subcli')
-    
+    from .parser.args_parser.argv import report
+    from .parser.args_parser.exceptions import ResponseFileError
+    try:
+        argv = Argv(
+            launcher=('argsense', 'run'),
+            target=(target,),
+            args=c_args,
+        )
+    except ResponseFileError as err:
+        report(err.index, str(err))
+        return
     with open(target, 'r', encoding='utf-8') as f:
-        # init subcli commands
-        exec(
-            '{}\n{}'.format(
-                f.read(),
-                dedent(
-                    '''
-                    from types import FunctionType
-                    public_funcs = tuple(
-                        v
-                        for k, v in locals().items()
-                        if not k.startswith('_')
-                        and type(v) is FunctionType
-                    )
-                    # print(':l', public_funcs)
-                    for f in public_funcs:
-                        __cli__.add_cmd(f)
-                    '''
+        source = f.read()
+    
+    # help is rendered from the static manifest, without executing target. -
+    # see `./manifest.py`.
+    from .manifest import build_manifest
+    if (manifest := build_manifest(target, source)) is not None:
+        from .manifest import make_functions
+        subcli = CommandLineInterface('argsense-subcli', lazy=True)
+        for func in make_functions(
+            manifest, '<argsense manifest: {}>'.format(target)
+        ):
+            subcli.add_cmd(func)
+        if _is_help_request(subcli, argv):
+            subcli.exec_argv(argv)
+            return
+    
+    # the subcli is lazy: when a command is named in argv, only its func info -
+    # is built. the others are parsed only if the group help is requested.
+    subcli = CommandLineInterface('argsense-subcli', lazy=True)
+    
+    # init subcli commands
+    exec(
+        '{}\n{}'.format(
+            source,
+            dedent(
+                '''
+                from types import FunctionType
+                public_funcs = tuple(
+                    v
+                    for k, v in locals().items()
+                    if not k.startswith('_')
+                    and type(v) is FunctionType
                 )
-            ),
-            {
-                '__name__': '__main__',
-                '__file__': os.path.abspath(target),
-                '__cli__' : subcli,
-            }
-        )
-        
-        subcli.exec_argv(
-            argv=Argv(
-                launcher=('argsense', 'run'),
-                target=(target,),
-                args=c_args,
+                # print(':l', public_funcs)
+                for f in public_funcs:
+                    __cli__.add_cmd(f)
+                '''
             )
+        ),
+        {
+            '__name__': '__main__',
+            '__file__': os.path.abspath(target),
+            '__cli__' : subcli,
+        }
+    )
+    
+    subcli.exec_argv(argv)
+
+
+def _is_help_request(subcli: CommandLineInterface, argv: Argv) -> bool:
+    from .parser import FuncInfo
+    from .parser import parse_argv
+    from .parser.args_parser.exceptions import ArgvParsingFailed
+    func = subcli._cname_2_func.get(argv.possible_function)
+    try:
+        result = parse_argv(
+            argv,
+            mode='group',
+            front_matter=(
+                FuncInfo.GLOBAL_FRONT_MATTER if func is None else
+                subcli.get_func_info(func).front_matter
+            ),
+            raise_error=True,
         )
+    except ArgvParsingFailed:
+        return False  # let the real commands report it.
+    return ':help' in result['kwargs']
 
 
 if __name__ == '__main__':
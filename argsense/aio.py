@@ -0,0 +1,77 @@
+"""
+asyncio support for `async def` commands.
+
+every thread owns one persistent event loop, it is created on first use and -
+reused by all coroutine commands running in that thread, including the -
+iterations of func-loop mode (`:loop`). it is closed at exit.
+
+this module is imported only when a coroutine command is going to run, so -
+that sync-only tools do not pay for importing asyncio.
+"""
+import asyncio
+import atexit
+import threading
+import typing as t
+
+from . import config
+
+_local = threading.local()
+_loops: t.List[asyncio.AbstractEventLoop] = []
+
+
+def run_coroutine(coro: t.Coroutine) -> t.Any:
+    """
+    run coroutine to complete, and return its result.
+    
+    if there is a running loop in current thread (e.g. called from a -
+    jupyter notebook or another coroutine), it can not be blocked on:
+        - if `config.REUSE_RUNNING_LOOP` is true, the coroutine is scheduled -
+        on the running loop and an `asyncio.Task` is returned instead.
+        - else, it runs in a helper thread with a temporary loop.
+    """
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        return get_loop().run_until_complete(coro)
+    if config.REUSE_RUNNING_LOOP:
+        return running.create_task(coro)
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """ the persistent loop of current thread. """
+    loop = getattr(_local, 'loop', None)
+    if loop is None or loop.is_closed():
+        loop = _local.loop = asyncio.new_event_loop()
+        if not _loops:
+            atexit.register(close_loops)
+        _loops.append(loop)
+    return loop
+
+
+def iterate_async_gen(agen: t.AsyncGenerator) -> t.Iterator:
+    """
+    drive an async generator from sync code on the loop of current thread. -
+    it must not be called when that loop is running.
+    """
+    loop = get_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(agen.aclose())
+
+
+def close_loops() -> None:
+    for loop in _loops:
+        if not loop.is_closed() and not loop.is_running():
+            try:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
+    _loops.clear()
@@ -1,9 +1,18 @@
 import shlex
 import typing as t
+from inspect import isawaitable
+from inspect import iscoroutine
 from types import FunctionType
+from weakref import WeakKeyDictionary
+from . import cache
 from . import config
+from . import console
 from . import parser as p
 
+_func_infos: 'WeakKeyDictionary[FunctionType, t.Tuple[tuple, p.FuncInfo]]' = (
+    WeakKeyDictionary()
+)  # {func: (state, func_info)}, see `_get_func_info`.
+
 
 def run_func(
     func: FunctionType,
@@ -12,40 +21,90 @@ def run_func(
     target: str = '<target>',
 ) -> t.Any:
     """
+    if `func` is a coroutine function, it is run to complete on an event loop, -
+    see `./aio.py : def run_coroutine()`.
+    
     limitation:
         - cannot use ":help" in argstring.
         - cannot use ":loop" in argstring.
+        - cannot use ":batch" or ":parallel" in argstring.
+        - cannot use ":json", ":ndjson" or ":msgpack" in argstring, the -
+        return value is returned as is.
     """
-    func_info = p.parse_function(func, fallback_type=config.FALLBACK_TYPE)
-    docs_info = p.parse_docstring(func.__doc__ or '', func_info)
-    func_info.fill_docs_info(docs_info)
-    
+    _args, _kwargs = _parse(func, argstring, launcher, target)
+    console.setup_for_dispatch()
+    out = func(*_args, **_kwargs)
+    if iscoroutine(out):
+        from .aio import run_coroutine
+        return run_coroutine(out)
+    return out
+
+
+async def run_func_async(
+    func: FunctionType,
+    argstring: str,
+    launcher: str = 'python',
+    target: str = '<target>',
+) -> t.Any:
+    """
+    the async counterpart of `run_func`, to be awaited in a running loop. -
+    sync functions are called directly.
+    """
+    _args, _kwargs = _parse(func, argstring, launcher, target)
+    console.setup_for_dispatch()
+    out = func(*_args, **_kwargs)
+    if isawaitable(out):
+        out = await out
+    return out
+
+
+def _parse(
+    func: FunctionType,
+    argstring: str,
+    launcher: str,
+    target: str,
+) -> t.Tuple[t.Iterable, t.Dict[str, t.Any]]:
     result = p.parse_argv(
         p.Argv(launcher, target, shlex.split(argstring)),
         mode='command',
-        front_matter={
-            'args'  : {
-                k: v['ctype']
-                for k, v in (
-                    {} if func_info is None else
-                    func_info.args
-                ).items()
-            },
-            'kwargs': {
-                k: v['ctype']
-                for k, v in (
-                    p.FuncInfo.GLOBAL_KWARGS if func_info is None else
-                    func_info.extended_kwargs
-                ).items()
-            },
-            'index' : (
-                p.FuncInfo.GLOBAL_CNAME_2_NAME if func_info is None else
-                func_info.cname_2_name
-            )
-        }
+        front_matter=_get_func_info(func).front_matter,
     )
     assert ':help' not in result['kwargs']
     assert ':loop' not in result['kwargs']
+    assert ':batch' not in result['kwargs']
+    assert ':parallel' not in result['kwargs']
+    assert not {':json', ':ndjson', ':msgpack'} & result['kwargs'].keys()
+    
+    return result['args'].values(), result['kwargs']
+
+
+def _get_func_info(func: FunctionType) -> p.FuncInfo:
+    """
+    func info is built once per function and reused by later calls, it is -
+    rebuilt if the function is modified in place (its code, defaults, -
+    docstring or annotations are reassigned), or the config options that -
+    affect parsing change. on a miss, the disk cache is checked first, like -
+    `cli.CommandLineInterface._build_func_info` does.
+    """
+    state = (
+        func.__code__,
+        func.__defaults__,
+        func.__kwdefaults__,
+        func.__doc__,
+        func.__annotations__,
+    )
+    stamp = cache.config_stamp()
+    if (x := _func_infos.get(func)) is not None:
+        (old_state, old_stamp), func_info = x
+        if old_stamp == stamp and all(
+            a is b for a, b in zip(old_state, state)
+        ):
+            return func_info
     
-    _args, _kwargs = result['args'].values(), result['kwargs']
-    return func(*_args, **_kwargs)
+    if (func_info := cache.load_func_info(func)) is None:
+        func_info = p.parse_function(func, fallback_type=config.FALLBACK_TYPE)
+        docs_info = p.parse_docstring(func.__doc__ or '', func_info)
+        func_info.fill_docs_info(docs_info)
+        cache.save_func_info(func, func_info)
+    _func_infos[func] = ((state, stamp), func_info)
+    return func_info
@@ -0,0 +1,452 @@
+"""
+batch mode: run many argstrings through one warm process.
+
+usage:
+    # every line of stdin is an argstring, appended to the given args.
+    python mytool.py :batch < lines.txt
+    python mytool.py hello :batch < lines.txt  # lines omit the command name.
+    
+    # run lines concurrently, see `config.PARALLEL_*` for options.
+    python mytool.py hello :parallel < lines.txt
+    
+    # or from code:
+    records = cli.exec_batch(open('lines.txt'))
+    records = cli.exec_parallel(open('lines.txt'), executor='process')
+
+each line is parsed and dispatched independently, a failing line does not -
+abort the rest. empty lines and lines starting with '#' are skipped.
+
+for every executed line, one json record is written to `output` (stdout by -
+default) as soon as it is done, i.e. newline delimited json:
+    {
+        'line'     : int,  # 1-based line number in source.
+        'args'     : [str, ...],
+        'status'   : 'ok' | 'error' | 'cancelled',
+        'exit_code': int,
+        'result'   : any,  # the return value, `repr` if not serializable.
+        'stdout'   : str,  # what the command printed.
+        'error'    : None | {'type': str, 'message': str, 'traceback': str},
+        'time'     : float,  # seconds.
+    }
+the command's stdout is captured into the record, so that the output stream -
+stays valid ndjson. stderr is not captured.
+"""
+import io
+import json
+import re
+import sys
+import threading
+import typing as t
+from contextlib import contextmanager
+from contextlib import redirect_stdout
+from inspect import iscoroutine
+from time import perf_counter
+
+from . import console
+from .parser import Argv
+from .parser import parse_argstring
+from .parser import parse_argv
+from .parser.args_parser.exceptions import ArgvParsingFailed
+from .parser.args_parser.exceptions import CommandNotFound
+from .parser.args_parser.exceptions import FunctionIsRequired
+
+if t.TYPE_CHECKING:
+    from .cli import CommandLineInterface
+
+
+class T:
+    Error = t.TypedDict('Error', {
+        'type'     : str,
+        'message'  : str,
+        'traceback': str,
+    })
+    Record = t.TypedDict('Record', {
+        'line'     : int,
+        'args'     : t.List[str],
+        'status'   : t.Literal['ok', 'error', 'cancelled'],
+        'exit_code': int,
+        'result'   : t.Any,
+        'stdout'   : str,
+        'error'    : t.Optional[Error],
+        'time'     : float,
+    })
+    Executor = t.Literal['thread', 'process']
+    Source = t.Union[str, t.Iterable[str], t.TextIO]
+    Task = t.Tuple[t.Callable, tuple, dict]  # (func, args, kwargs)
+
+
+def exec_batch(
+    cli: 'CommandLineInterface',
+    source: T.Source,
+    preset_func: t.Optional[t.Callable] = None,
+    prefix: t.Sequence[str] = (),
+    launcher: t.Tuple[str, ...] = ('python',),
+    target: t.Tuple[str] = ('<batch>',),
+    output: t.Optional[t.TextIO] = ...,
+) -> t.List[T.Record]:
+    """
+    params:
+        source: a multi-line string, an iterable of lines or a text file.
+        preset_func: the same as `cli.run(func)`, lines are arguments of this -
+            function. if not given, every line starts with a command name.
+        prefix: args to be put in front of every line.
+        output: where to write the ndjson records. defaults to stdout, pass -
+            None to disable.
+    returns:
+        all records.
+    """
+    output = sys.stdout if output is ... else output
+    records = []
+    for lineno, line in _iter_lines(source):
+        record, task = _prepare(
+            cli, preset_func, lineno, line, tuple(prefix), launcher, target
+        )
+        if task:
+            record.update(_run_task(*task))
+        records.append(record)
+        _emit(record, output)
+    return records
+
+
+def exec_parallel(
+    cli: 'CommandLineInterface',
+    source: T.Source,
+    preset_func: t.Optional[t.Callable] = None,
+    prefix: t.Sequence[str] = (),
+    launcher: t.Tuple[str, ...] = ('python',),
+    target: t.Tuple[str] = ('<batch>',),
+    output: t.Optional[t.TextIO] = ...,
+    executor: T.Executor = 'thread',
+    max_workers: int = None,
+    ordered: bool = True,
+    timeout: float = None,
+    fail_fast: bool = False,
+) -> t.List[T.Record]:
+    """
+    like `exec_batch`, but lines are executed concurrently in a pool.
+    
+    args are parsed in the calling thread, only the function calls are -
+    dispatched to the pool.
+    
+    params:
+        executor:
+            'thread': for i/o bound commands.
+            'process': for cpu bound commands. the function, its args and -
+                return value must be picklable.
+        max_workers: None means the default of `concurrent.futures`.
+        ordered: if true, records are written in the order of lines. else -
+            in the order of completion.
+        timeout: seconds, for each task since it starts running. a task that -
+            exceeds it gets a 'TimeoutError' record. note that a thread -
+            cannot be killed, it keeps running in background until it -
+            returns; worker processes are terminated at the end instead.
+        fail_fast: if true, the first failed task cancels all pending ones, -
+            they get 'cancelled' records.
+    returns:
+        all records, in the order of lines.
+    """
+    from concurrent import futures
+    
+    output = sys.stdout if output is ... else output
+    if executor == 'thread':
+        pool = futures.ThreadPoolExecutor(max_workers)
+    else:
+        pool = futures.ProcessPoolExecutor(max_workers)
+    
+    records = []
+    pending = {}  # {future: record}
+    started = {}  # {future: start_time}
+    emitted = 0
+    failed = False
+    timed_out = False
+    old_stdout = sys.stdout
+    if executor == 'thread':
+        sys.stdout = _ThreadLocalStdout(old_stdout)
+    
+    def flush_ordered() -> None:
+        nonlocal emitted
+        while emitted < len(records) and records[emitted]['status'] != '':
+            _emit(records[emitted], output, old_stdout)
+            emitted += 1
+    
+    def settle(future: 'futures.Future', update: dict) -> None:
+        nonlocal failed, timed_out
+        record = pending.pop(future)
+        started.pop(future, None)
+        record.update(update)
+        if record['status'] != 'ok':
+            failed = True
+            if update['exit_code'] == 124:
+                timed_out = True
+        if not ordered:
+            _emit(record, output, old_stdout)
+    
+    try:
+        for lineno, line in _iter_lines(source):
+            record, task = _prepare(
+                cli, preset_func, lineno, line, tuple(prefix), launcher, target
+            )
+            records.append(record)
+            if task and not (failed and fail_fast):
+                record['status'] = ''  # running
+                pending[pool.submit(_run_task, *task)] = record
+            elif task:
+                record.update(_cancelled())
+            else:
+                failed = True
+                if not ordered:
+                    _emit(record, output, old_stdout)
+        
+        while pending:
+            now = perf_counter()
+            for f in pending:
+                if f not in started and f.running():
+                    started[f] = now
+            wait_time = 0.05 if timeout else None
+            done, _ = futures.wait(
+                tuple(pending), wait_time, futures.FIRST_COMPLETED
+            )
+            for f in done:
+                try:
+                    settle(f, f.result())
+                except futures.CancelledError:
+                    settle(f, _cancelled())
+                except Exception as e:  # e.g. pickling error.
+                    settle(f, {
+                        'status'   : 'error',
+                        'exit_code': 1,
+                        'error'    : _error_info(e, str(e)),
+                    })
+            if timeout:
+                now = perf_counter()
+                for f, start in tuple(started.items()):
+                    if f in pending and now - start > timeout:
+                        settle(f, {
+                            'status'   : 'error',
+                            'exit_code': 124,
+                            'error'    : {
+                                'type'     : 'TimeoutError',
+                                'message'  : 'timeout after {}s'.format(
+                                    timeout
+                                ),
+                                'traceback': '',
+                            },
+                            'time'     : now - start,
+                        })
+            if failed and fail_fast:
+                for f in tuple(pending):
+                    if f.cancel():
+                        settle(f, _cancelled())
+            if ordered:
+                flush_ordered()
+        if ordered:
+            flush_ordered()
+    finally:
+        sys.stdout = old_stdout
+        for f in pending:
+            f.cancel()
+        if timed_out and executor == 'process':
+            # the timed out tasks may be still running.
+            for p in tuple((getattr(pool, '_processes', None) or {}).values()):
+                p.terminate()
+        pool.shutdown(wait=not timed_out)
+    return records
+
+
+# -----------------------------------------------------------------------------
+
+class _ThreadLocalStdout:
+    """
+    route writes to a per-thread buffer if `_run_task` has set one, so that -
+    concurrent tasks capture their own prints.
+    """
+    
+    def __init__(self, stdout: t.TextIO) -> None:
+        self._local = threading.local()
+        self._stdout = stdout
+    
+    def __getattr__(self, item: str) -> t.Any:
+        return getattr(self.target, item)
+    
+    @property
+    def target(self) -> t.TextIO:
+        return getattr(self._local, 'buffer', None) or self._stdout
+    
+    def set_buffer(self, buffer: t.Optional[t.TextIO]) -> None:
+        self._local.buffer = buffer
+    
+    def write(self, text: str) -> int:
+        return self.target.write(text)
+
+
+@contextmanager
+def _capture_stdout() -> t.Iterator[io.StringIO]:
+    """
+    lk_logger's print can not be captured (see `./console.py`), the builtin -
+    one is used in the context.
+    """
+    buffer = io.StringIO()
+    if isinstance(sys.stdout, _ThreadLocalStdout):
+        proxy = sys.stdout
+        proxy.set_buffer(buffer)
+        try:
+            with console.plain_print():
+                yield buffer
+        finally:
+            proxy.set_buffer(None)
+    else:
+        with redirect_stdout(buffer), console.plain_print():
+            yield buffer
+
+
+def _cancelled() -> dict:
+    return {
+        'status'   : 'cancelled',
+        'exit_code': 1,
+        'error'    : {
+            'type'     : 'CancelledError',
+            'message'  : 'cancelled since a previous task failed.',
+            'traceback': '',
+        },
+    }
+
+
+def _emit(
+    record: T.Record,
+    output: t.Optional[t.TextIO],
+    stdout: t.TextIO = None,
+) -> None:
+    if output is not None:
+        if output is sys.stdout and stdout:  # bypass `_ThreadLocalStdout`.
+            output = stdout
+        output.write(json.dumps(record, default=repr) + '\n')
+        output.flush()
+
+
+def _iter_lines(source: T.Source) -> t.Iterator[t.Tuple[int, str]]:
+    if isinstance(source, str):
+        source = source.splitlines()
+    for lineno, line in enumerate(source, 1):
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield lineno, line
+
+
+def _prepare(
+    cli: 'CommandLineInterface',
+    preset_func: t.Optional[t.Callable],
+    lineno: int,
+    line: str,
+    prefix: t.Tuple[str, ...],
+    launcher: t.Tuple[str, ...],
+    target: t.Tuple[str],
+) -> t.Tuple[T.Record, t.Optional[T.Task]]:
+    """
+    returns: (record, task)
+        task is None if the line fails in parsing, the record is filled with -
+        the error then.
+    """
+    record: T.Record = {
+        'line'     : lineno,
+        'args'     : [],
+        'status'   : 'error',
+        'exit_code': 1,
+        'result'   : None,
+        'stdout'   : '',
+        'error'    : None,
+        'time'     : 0.0,
+    }
+    start = perf_counter()
+    try:
+        record['args'] = [*prefix, *parse_argstring(line)]
+        argv = Argv(launcher, target, tuple(record['args']))
+        func, args, kwargs = _resolve(cli, preset_func, argv)
+    except ArgvParsingFailed as e:
+        record['exit_code'] = 2
+        record['error'] = _error_info(e, _plain(str(e)), with_tb=False)
+    except Exception as e:
+        record['error'] = _error_info(e, str(e))
+    else:
+        return record, (func, tuple(args), kwargs)
+    record['time'] = perf_counter() - start
+    return record, None
+
+
+def _run_task(func: t.Callable, args: tuple, kwargs: dict) -> dict:
+    """
+    returns: a partial record, which updates the one from `_prepare`.
+    note: this is a module level function to be picklable for process pool.
+    """
+    out = {'status': 'error', 'exit_code': 1, 'error': None}
+    start = perf_counter()
+    with _capture_stdout() as stdout:
+        try:
+            out['result'] = func(*args, **kwargs)
+            if iscoroutine(out['result']):
+                from .aio import run_coroutine
+                out['result'] = run_coroutine(out['result'])
+        except SystemExit as e:
+            if e.code is None or e.code == 0:
+                out['status'], out['exit_code'] = 'ok', 0
+            else:
+                out['exit_code'] = e.code if isinstance(e.code, int) else 1
+                out['error'] = _error_info(
+                    e, 'exit code {}'.format(e.code), with_tb=False
+                )
+        except Exception as e:
+            out['error'] = _error_info(e, str(e))
+        else:
+            out['status'], out['exit_code'] = 'ok', 0
+    out['stdout'] = stdout.getvalue()
+    out['time'] = perf_counter() - start
+    return out
+
+
+def _resolve(
+    cli: 'CommandLineInterface',
+    preset_func: t.Optional[t.Callable],
+    argv: Argv,
+) -> t.Tuple[t.Callable, t.Iterable, t.Dict[str, t.Any]]:
+    """
+    find the function and parse args for it, like `cli.exec_argv` does, but -
+    raises errors instead of reporting them.
+    """
+    if preset_func:
+        func = preset_func
+    elif (name := argv.possible_function) is None:
+        raise FunctionIsRequired(argv.argx)
+    elif (func := cli._cname_2_func.get(name)) is None:
+        raise CommandNotFound(
+            argv.command_index, name, cli._cname_2_func.keys()
+        )
+    
+    result = parse_argv(
+        argv,
+        mode='command' if preset_func else 'group',
+        front_matter=cli.get_func_info(func).front_matter,
+        raise_error=True,
+    )
+    for x in (
+        ':help', ':loop', ':batch', ':parallel', ':json', ':ndjson', ':msgpack'
+    ):
+        if x in result['kwargs']:
+            raise ValueError('"{}" is not supported in batch mode.'.format(
+                x if x != ':help' else '--help'
+            ))
+    return func, result['args'].values(), result['kwargs']
+
+
+def _error_info(
+    e: BaseException, message: str, with_tb: bool = True
+) -> T.Error:
+    if with_tb:
+        import traceback
+        tb = ''.join(traceback.format_exception(type(e), e, e.__traceback__))
+    else:
+        tb = ''
+    return {'type': type(e).__name__, 'message': message, 'traceback': tb}
+
+
+def _plain(text: str) -> str:
+    """ remove rich markups. """
+    return re.sub(r'(?<!\\)\[/?[-#\w ]*]', '', text).replace('\\[', '[')
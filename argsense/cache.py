@@ -0,0 +1,241 @@
+"""
+persistent cache of parsed func info.
+
+every source file owns one cache file under `config.CACHE_DIR`, which stores -
+the pickled `FuncInfo` (docs info already filled) of the functions defined in -
+it.
+
+invalidation:
+    the whole cache file is dropped when:
+        - argsense version or the cache schema changes.
+        - config options that affect parsing change (see `config_stamp`).
+        - the source file's mtime or size changes and its content hash -
+        differs as well.
+    a single entry is dropped when the function's name, parameter names, -
+    docstring, defaults or annotations differ from what they were when it -
+    was cached. this covers the cases that the source file is not changed -
+    but the values are (for example a default value imported from another -
+    module).
+
+enable:
+    the cache is off by default, set `config.USE_CACHE = True` to enable it. -
+    environment variable `ARGSENSE_NO_CACHE=1` disables it again.
+    use `clear()` to remove all cache files.
+
+safety:
+    the cache files are loaded with pickle, so only the files that are owned -
+    by current user and not writable by others are trusted. the cache dir -
+    is created private (0700).
+
+the cache is only an accelerator: a corrupt, unreadable or unwritable cache -
+falls back to parsing the function in place, silently.
+"""
+import atexit
+import hashlib
+import inspect
+import os
+import pickle
+import typing as t
+from types import FunctionType
+
+from . import config
+from .cache_dir import make_cache_dir
+
+if t.TYPE_CHECKING:
+    from .parser import FuncInfo
+
+
+class T:
+    Entries = t.Dict[str, t.Tuple[str, bytes]]  # {key: (fingerprint, data)}
+    CacheFile = t.TypedDict('CacheFile', {
+        'schema' : int,
+        'version': str,
+        'stamp'  : tuple,
+        'mtime'  : int,
+        'size'   : int,
+        'digest' : str,
+        'entries': Entries,
+    })
+
+
+_SCHEMA = 4  # bump this when the pickled layout of `FuncInfo` changes.
+_files: t.Dict[str, t.Optional['_CacheFile']] = {}  # {source: cache_file}
+
+
+def is_enabled() -> bool:
+    return config.USE_CACHE and os.getenv('ARGSENSE_NO_CACHE') != '1'
+
+
+def load_func_info(func: t.Callable) -> t.Optional['FuncInfo']:
+    if not (is_enabled() and (file := _get_cache_file(func))):
+        return None
+    return file.get(_get_key(func), _get_fingerprint(func))
+
+
+def save_func_info(func: t.Callable, func_info: 'FuncInfo') -> None:
+    if not (is_enabled() and (file := _get_cache_file(func))):
+        return
+    file.set(_get_key(func), _get_fingerprint(func), func_info)
+
+
+def flush() -> None:
+    for file in _files.values():
+        if file:
+            file.dump()
+
+
+def forget(source: str) -> None:
+    """
+    drop the in-process state of a source file, so that it is checked -
+    against the file again, e.g. after a hot reload (see `./reload.py`).
+    """
+    if file := _files.pop(source, None):
+        file.dump()
+
+
+def clear() -> None:
+    _files.clear()
+    if os.path.isdir(config.CACHE_DIR):
+        for name in os.listdir(config.CACHE_DIR):
+            if name.endswith('.pkl'):
+                try:
+                    os.remove(os.path.join(config.CACHE_DIR, name))
+                except OSError:
+                    pass
+
+
+# -----------------------------------------------------------------------------
+
+class _CacheFile:
+    
+    def __init__(self, source: str) -> None:
+        self.source = os.path.abspath(source)
+        self.path = os.path.join(
+            config.CACHE_DIR,
+            hashlib.sha1(self.source.encode('utf-8')).hexdigest()[:16] + '.pkl'
+        )
+        self.dirty = False
+        self.data = self._load()
+    
+    def get(self, key: str, fingerprint: str) -> t.Optional['FuncInfo']:
+        if (entry := self.data['entries'].get(key)) is None:
+            return None
+        if entry[0] != fingerprint:
+            return None
+        try:
+            return pickle.loads(entry[1])
+        except Exception:
+            self.data['entries'].pop(key)
+            self.dirty = True
+            return None
+    
+    def set(self, key: str, fingerprint: str, func_info: 'FuncInfo') -> None:
+        try:
+            data = pickle.dumps(func_info, pickle.HIGHEST_PROTOCOL)
+        except Exception:  # e.g. a default value is not picklable.
+            return
+        self.data['entries'][key] = (fingerprint, data)
+        self.dirty = True
+    
+    def dump(self) -> None:
+        if not self.dirty:
+            return
+        self.dirty = False
+        temp = '{}.{}.tmp'.format(self.path, os.getpid())
+        try:
+            make_cache_dir(config.CACHE_DIR)
+            with open(temp, 'wb') as f:
+                pickle.dump(self.data, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp, self.path)
+        except OSError:
+            if os.path.exists(temp):
+                os.remove(temp)
+    
+    def _load(self) -> T.CacheFile:
+        st = os.stat(self.source)
+        try:
+            with open(self.path, 'rb') as f:
+                assert _is_trusted(os.fstat(f.fileno()))
+                data: T.CacheFile = pickle.load(f)
+            assert isinstance(data, dict)
+            assert data['schema'] == _SCHEMA
+            assert data['version'] == _get_version()
+            assert data['stamp'] == config_stamp()
+            assert isinstance(data['entries'], dict)
+        except Exception:  # missing, corrupt or outdated.
+            return self._new_data(st)
+        if (data['mtime'], data['size']) == (st.st_mtime_ns, st.st_size):
+            return data
+        # the file is touched, check if its content really changed.
+        new_data = self._new_data(st)
+        if new_data['digest'] == data['digest']:
+            new_data['entries'] = data['entries']
+        self.dirty = True
+        return new_data
+    
+    def _new_data(self, st: os.stat_result) -> T.CacheFile:
+        with open(self.source, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        return {
+            'schema' : _SCHEMA,
+            'version': _get_version(),
+            'stamp'  : config_stamp(),
+            'mtime'  : st.st_mtime_ns,
+            'size'   : st.st_size,
+            'digest' : digest,
+            'entries': {},
+        }
+
+
+def config_stamp() -> tuple:
+    """ the config options that affect parsing function. """
+    return (
+        config.ALLOW_HSHORT_TO_BE_REDEFINED,
+        config.ARG_NAME_STYLE,
+        config.BARE_NONE_MEANS_ANY,
+        config.FALLBACK_TYPE,
+    )
+
+
+def _get_cache_file(func: t.Callable) -> t.Optional[_CacheFile]:
+    # wrapped functions are excluded, their signature and docstring may come -
+    # from another file.
+    if type(func) is not FunctionType or hasattr(func, '__wrapped__'):
+        return None
+    source = func.__code__.co_filename
+    if source not in _files:
+        if not _files:
+            atexit.register(flush)
+        try:
+            _files[source] = _CacheFile(source)
+        except OSError:  # not a real file, e.g. '<string>'.
+            _files[source] = None
+    return _files[source]
+
+
+def _get_fingerprint(func: FunctionType) -> str:
+    code = func.__code__
+    return repr((
+        func.__name__,
+        code.co_varnames[:code.co_argcount + code.co_kwonlyargcount],
+        code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS),
+        func.__doc__,
+        func.__defaults__,
+        func.__kwdefaults__,
+        func.__annotations__,
+    ))
+
+
+def _get_key(func: FunctionType) -> str:
+    return '{}:{}'.format(func.__qualname__, func.__code__.co_firstlineno)
+
+
+def _get_version() -> str:
+    from . import __version__
+    return __version__
+
+
+def _is_trusted(st: os.stat_result) -> bool:
+    if not hasattr(os, 'getuid'):  # windows.
+        return True
+    return st.st_uid == os.getuid() and not st.st_mode & 0o022
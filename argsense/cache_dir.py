@@ -0,0 +1,24 @@
+"""
+the default cache dir, shared by `config.CACHE_DIR`, the daemon sockets and -
+the completion indexes.
+
+this module imports nothing but `os`, so that the clients executed as plain -
+files (see `./daemon.py` and `./completion.py`) can use it without importing -
+the argsense package.
+"""
+import os
+
+
+def get_cache_dir() -> str:
+    return os.getenv('ARGSENSE_CACHE_DIR') or os.path.join(
+        os.getenv('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+        'argsense'
+    )
+
+
+def make_cache_dir(path: str) -> None:
+    """
+    create `path` if it does not exist. a new dir is private to current user -
+    (0700), the cache files in it are loaded with pickle.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
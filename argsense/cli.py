@@ -1,7 +1,15 @@
+import os
+import sys
 import typing as t
+from inspect import isasyncgen
+from inspect import iscoroutinefunction
+from inspect import isgenerator
 from textwrap import dedent
+from time import perf_counter
 
+from . import cache
 from . import config
+from . import console
 from .parser import Argv
 from .parser import FuncInfo
 from .parser import ParamType
@@ -9,6 +17,9 @@ from .parser import parse_argv
 from .parser import parse_argstring
 from .parser import parse_docstring
 from .parser import parse_function
+from .parser.args_parser.argv import report
+from .parser.args_parser.exceptions import ArgvParsingFailed
+from .parser.args_parser.exceptions import CommandNotFound
 
 
 class T:
@@ -23,14 +34,31 @@ class T:
     FuncInfo = FuncInfo
     
     CommandsCollect = t.Dict[_FunctionId, FuncInfo]
+    CommandsRegistry = t.Dict[_FunctionId, t.Tuple[t.Callable, str, bool]]
 
 
 class CommandLineInterface:
     
-    def __init__(self, name: str = None) -> None:
+    def __init__(self, name: str = None, lazy: bool = None) -> None:
+        """
+        params:
+            lazy: if true, `add_cmd` only records the function, its func info -
+                is built on first access (dispatching, rendering help or -
+                calling `warm_up`).
+                if None, follows `config.LAZY_REGISTRATION`.
+        """
         self.name = name
-        self.commands: T.CommandsCollect = {}
+        self.lazy = lazy
+        self._async_funcs: t.Set[T._FunctionId] = set()
         self._cname_2_func = {}
+        self._reloading = False  # see `./reload.py`.
+        self._commands: T.CommandsCollect = {}
+        self._registry: T.CommandsRegistry = {}
+    
+    @property
+    def commands(self) -> T.CommandsCollect:
+        self.warm_up()
+        return self._commands
         
     def __call__(self, func: T.Func) -> T.Func:
         """
@@ -67,7 +95,11 @@ class CommandLineInterface:
             (cmd_name in self._cname_2_func) and
             (new := func) is not (old := self._cname_2_func[cmd_name])
         ):
-            if config.WARN_IF_DUPLICATE_COMMANDS_OVERRIDDEN:
+            if (
+                config.WARN_IF_DUPLICATE_COMMANDS_OVERRIDDEN and
+                not self._reloading
+            ):
+                console.setup()
                 print(
                     ':v6pr',
                     f'duplicate command name: {cmd_name}',
@@ -77,20 +109,98 @@ class CommandLineInterface:
                     if config.OVERWRITTEN_SCHEME == 'first'
                     else '[yellow dim]the incoming one is used.[/]'
                 )
-            if config.OVERWRITTEN_SCHEME == 'first':
+            if config.OVERWRITTEN_SCHEME == 'first' and not self._reloading:
                 return
+            if self._registry.get(id(old), (None, None))[1] == cmd_name:
+                # drop the overridden one, so that it is no longer listed.
+                self._registry.pop(id(old))
+                self._commands.pop(id(old), None)
+                self._async_funcs.discard(id(old))
         
         self._cname_2_func[cmd_name] = func
+        self._registry[id(func)] = (func, cmd_name, transfer_help)
+        if iscoroutinefunction(func):
+            self._async_funcs.add(id(func))
         
-        func_info = parse_function(func, fallback_type=config.FALLBACK_TYPE)
-        docs_info = parse_docstring(func.__doc__ or '', func_info)
+        if config.LAZY_REGISTRATION if self.lazy is None else self.lazy:
+            self._commands.pop(id(func), None)
+        else:
+            self._commands[id(func)] = self._build_func_info(id(func))
+    
+    def get_func_info(self, func: T.Func) -> T.FuncInfo:
+        if (uid := id(func)) not in self._commands:
+            self._commands[uid] = self._build_func_info(uid)
+        return self._commands[uid]
+    
+    def warm_up(self) -> None:
+        """
+        build func info for all pending commands, and keep them in the -
+        registration order.
+        """
+        if len(self._commands) < len(self._registry):
+            self._commands = {
+                uid: self.get_func_info(func)
+                for uid, (func, _, _) in self._registry.items()
+            }
+    
+    def _build_func_info(self, uid: T._FunctionId) -> T.FuncInfo:
+        func, cmd_name, transfer_help = self._registry[uid]
+        
+        if (func_info := cache.load_func_info(func)) is None:
+            func_info = parse_function(
+                func, fallback_type=config.FALLBACK_TYPE
+            )
+            docs_info = parse_docstring(func.__doc__ or '', func_info)
+            func_info.fill_docs_info(docs_info)
+            cache.save_func_info(func, func_info)
         
         func_info.target = func
         func_info.name = cmd_name
         func_info.transfer_help = transfer_help  # FIXME: temp solution
-        func_info.fill_docs_info(docs_info)
-        
-        self.commands[id(func)] = func_info
+        return func_info
+    
+    def _call(
+        self,
+        func: t.Callable,
+        args: t.Iterable,
+        kwargs: t.Dict[str, t.Any],
+        output_format: str = '',
+    ) -> t.Any:
+        """
+        call the function, coroutine functions are driven by an event loop, -
+        see `./aio.py`.
+        if `output_format` is set, stdout is reserved for the output, the -
+        prints of the function go to stderr. see `./output.py : def -
+        redirect_prints`.
+        """
+        console.setup_for_dispatch()
+        if output_format:
+            from .output import redirect_prints
+            with redirect_prints(output_format):
+                return self._call(func, args, kwargs)
+        if id(func) in self._async_funcs or (
+            id(func) not in self._registry and iscoroutinefunction(func)
+        ):
+            from .aio import run_coroutine
+            return run_coroutine(func(*args, **kwargs))
+        return func(*args, **kwargs)
+    
+    @staticmethod
+    def _emit(out: t.Any, output_format: str) -> t.Any:
+        """
+        a generator (or async generator) returned by command is driven here, -
+        its elements are written to stdout as they are produced, and None is -
+        returned. other values are written only if `output_format` is set.
+        see `./output.py`.
+        """
+        if isgenerator(out) or isasyncgen(out):
+            from .output import stream_output
+            stream_output(out, output_format)
+            return None
+        if output_format:
+            from .output import write_output
+            write_output(out, output_format)
+        return out
     
     # -------------------------------------------------------------------------
     # decorators
@@ -114,19 +224,95 @@ class CommandLineInterface:
     # run
     
     def run(self, func: T.Func = None, transport_help: bool = False) -> t.Any:
-        config.apply_changes()
         return self.exec_argv(
             argv=Argv.from_sys_argv(),
             preset_func=func,
             transport_help=transport_help,
         )
     
+    def exec_batch(
+        self,
+        source: t.Union[str, t.Iterable[str], t.TextIO],
+        preset_func: t.Optional[T.Func] = None,
+        prefix: t.Sequence[str] = (),
+        **kwargs
+    ) -> t.List[dict]:
+        """
+        run every line of `source` as an argstring in this process. a failed -
+        line does not abort the rest.
+        see `./batch.py : def exec_batch` for params and the record format.
+        """
+        from .batch import exec_batch
+        return exec_batch(self, source, preset_func, prefix, **kwargs)
+    
+    def exec_parallel(
+        self,
+        source: t.Union[str, t.Iterable[str], t.TextIO],
+        preset_func: t.Optional[T.Func] = None,
+        prefix: t.Sequence[str] = (),
+        **kwargs
+    ) -> t.List[dict]:
+        """
+        like `exec_batch`, but run lines concurrently in a thread or process -
+        pool.
+        see `./batch.py : def exec_parallel` for params.
+        """
+        from .batch import exec_parallel
+        return exec_parallel(self, source, preset_func, prefix, **kwargs)
+    
+    def serve(self, func: T.Func = None, address: str = None) -> None:
+        """
+        keep the commands warm in a long-lived process, and serve the -
+        invocations forwarded by `python -m argsense.daemon run ...`.
+        see `./daemon.py` for details.
+        
+        params:
+            func: the preset function, like `run(func)`.
+            address: unix socket path. defaults to a path derived from -
+                `sys.argv[0]`, see `daemon.get_address`.
+        """
+        from .daemon import serve
+        serve(self, func, address)
+    
+    def completion_script(
+        self,
+        shell: str = 'bash',
+        prog: str = None,
+        func: T.Func = None,
+        target: str = None,
+    ) -> str:
+        """
+        build the completion index of this cli and return the completion -
+        script for `shell` ('bash', 'zsh' or 'fish').
+        see `./completion.py` for details.
+        
+        params:
+            prog: the command name that user types in shell. defaults to -
+                the stem of `target`.
+            func: the preset function, like `run(func)`.
+            target: the script path that defines the commands. defaults to -
+                `sys.argv[0]`.
+        """
+        from .completion import build_index
+        from .completion import get_index_path
+        from .completion import get_script
+        from .completion import save_index
+        target = target or sys.argv[0]
+        index_path = get_index_path(
+            target, func and self._registry[id(func)][1]
+        )
+        save_index(build_index(self, target, func), index_path)
+        return get_script(
+            shell,  # noqa
+            prog or os.path.splitext(os.path.basename(target))[0],
+            index_path,
+        )
+    
     def exec_argv(
         self,
         argv: Argv,
         preset_func: t.Optional[T.Func] = None,
         transport_help: bool = False,
-        _loop_verbose: bool = True,
     ) -> t.Optional[t.Any]:
         cli_help_form: T.CommandType
         # func_info: T.FuncInfo
@@ -138,42 +324,60 @@ class CommandLineInterface:
         func: t.Optional[t.Callable]
         if preset_func:
             func = preset_func
+        elif name := argv.possible_function:
+            # the pre-scan follows the same rule as the parser, so the -
+            # command found here is the same as `result['command']` below.
+            if (func := self._cname_2_func.get(name)) is None:
+                err = CommandNotFound(
+                    argv.command_index, name, self._cname_2_func.keys()
+                )
+                if os.getenv('ARGSENSE_DEBUG') == '1':
+                    raise err
+                report(err.index, str(err), argv=argv)
         else:
-            if argv.possible_function:
-                func = self._cname_2_func[argv.possible_function]
-            else:
-                func = None
+            func = None
         
-        func_info = func and self.commands[id(func)]
+        func_info = func and self.get_func_info(func)
         result = parse_argv(
             argv,
             mode=cli_help_form,
-            front_matter={
-                'args'  : {
-                    k: v['ctype']
-                    for k, v in (
-                        {} if func_info is None else
-                        func_info.args
-                    ).items()
-                },
-                'kwargs': {
-                    k: v['ctype']
-                    for k, v in (
-                        FuncInfo.GLOBAL_KWARGS if func_info is None else
-                        func_info.extended_kwargs
-                    ).items()
-                },
-                'index' : (
-                    FuncInfo.GLOBAL_CNAME_2_NAME if func_info is None else
-                    func_info.cname_2_name
-                )
-            }
+            front_matter=(
+                FuncInfo.GLOBAL_FRONT_MATTER if func_info is None else
+                func_info.front_matter
+            )
         )
         
-        if result['command']:
-            func = self._cname_2_func[result['command']]
-            if func:
-                func_info = self.commands[id(func)]  # noqa
+        if ':batch' in result['kwargs'] or ':parallel' in result['kwargs']:
+            # read argstrings from stdin, the other args in argv are put in -
+            # front of each line.
+            specials = {
+                result['kwargs'][x] - argv.argx
+                for x in (':batch', ':parallel')
+                if x in result['kwargs']
+            }
+            kwargs = dict(
+                prefix=tuple(
+                    x for i, x in enumerate(argv.args) if i not in specials
+                ),
+                launcher=argv.launcher,
+                target=argv.target,
+            )
+            if ':parallel' in result['kwargs']:
+                records = self.exec_parallel(
+                    sys.stdin,
+                    preset_func,
+                    executor=config.PARALLEL_EXECUTOR,
+                    max_workers=config.PARALLEL_MAX_WORKERS or None,
+                    ordered=config.PARALLEL_ORDERED,
+                    timeout=config.PARALLEL_TIMEOUT or None,
+                    fail_fast=config.PARALLEL_FAIL_FAST,
+                    **kwargs
+                )
+            else:
+                records = self.exec_batch(sys.stdin, preset_func, **kwargs)
+            if any(x['status'] != 'ok' for x in records):
+                sys.exit(1)
+            return records
         
         # print(result, func, ':vl')
         
@@ -197,7 +401,6 @@ class CommandLineInterface:
                 else:
                     return False, False
         
-        from . import renderer
         if func:
             has_help, is_explicit = get_help_option(
                 # FIXME: `consider_transport_action` need redesign.
@@ -207,79 +410,229 @@ class CommandLineInterface:
                 # )
             )
             if has_help and not transport_help:
+                from . import renderer
                 renderer.render_function_parameters(
                     argv,
-                    self.commands[id(func)],
+                    func_info,
                     show_func_name_in_title=not single_func_entrance
                 )
             else:
                 enter_func_loop = result['kwargs'].pop(':loop', False)
+                output_format = _pop_output_format(result['kwargs'])
                 _args, _kwargs = result['args'].values(), result['kwargs']
+                start = perf_counter()
                 try:
-                    # noinspection PyCallingNonCallable
-                    out = func(*_args, **_kwargs)
+                    out = self._call(func, _args, _kwargs, output_format)
                 except Exception as e:
                     if has_help and transport_help:
+                        from . import renderer
                         renderer.render_function_parameters(
                             argv,
-                            self.commands[id(func)],
+                            func_info,
                             show_func_name_in_title=not single_func_entrance
                         )
                         return
                     else:
                         raise e
+                out = self._emit(out, output_format)
                 if enter_func_loop:
-                    flag = _loop_verbose
-                    while True:
-                        if flag:
-                            print(dedent(
-                                '''
-                                argsense func-loop mode:
-                                    1) input new args to rerun the function;
-                                    2) input empty (just press enter) to rerun -
-                                    function with last-time args;
-                                    3) input underscore ("_") to rerun -
-                                    function with original args (i.e. read -
-                                    from `sys.argv`);
-                                    4) input "exit" or ":q" to quit the loop;
-                                '''
-                            ).replace(' -\n    ', ' ').rstrip(), ':v1')
-                            flag = False
-                        cmd = input('[argsense] input command here: ').strip()
-                        
-                        if cmd == 'exit' or cmd == ':q':
-                            break
-                        elif cmd == '':
-                            try:
-                                # noinspection PyCallingNonCallable
-                                out = func(*_args, **_kwargs)
-                            except Exception as e:
-                                print(':e', e)
-                        else:
-                            if cmd == '_':
-                                new_argv = Argv.from_sys_argv()
-                                assert ':loop' in new_argv.args
-                            else:
-                                try:
-                                    new_args = parse_argstring(cmd)
-                                except Exception as e:
-                                    print(':e', e)
-                                    continue
-                                else:
-                                    new_args.append(':loop')
-                                new_argv = Argv(
-                                    argv.launcher, argv.target, new_args
-                                )
-                            return self.exec_argv(
-                                argv=new_argv,
-                                preset_func=func,
-                                _loop_verbose=False,
-                            )
+                    return self._func_loop(
+                        func, argv, cli_help_form, _args, _kwargs, out,
+                        perf_counter() - start, output_format
+                    )
                 return out
         else:
             has_help, is_explicit = get_help_option()
             assert has_help
+            from . import renderer
             renderer.render_functions(argv, self.commands.values())
+    
+    def _func_loop(
+        self,
+        func: t.Callable,
+        argv: Argv,
+        mode: T.CommandType,
+        args: t.Iterable,
+        kwargs: t.Dict[str, t.Any],
+        out: t.Any,
+        elapsed: float,
+        output_format: str = '',
+    ) -> t.Any:
+        """
+        the driver of func-loop mode (`:loop`), run after the first call of -
+        `func`.
+        it is iterative, each input is parsed and dispatched in place, so the -
+        call stack and memory do not grow with the number of runs: only the -
+        last-time args, the last output and a few timing numbers are kept.
+        
+        returns the output of the last run.
+        """
+        console.setup()
+        print(dedent(
+            '''
+            argsense func-loop mode:
+                1) input new args to rerun the function;
+                2) input empty (just press enter) to rerun -
+                function with last-time args;
+                3) input underscore ("_") to rerun -
+                function with original args (i.e. read -
+                from `sys.argv`);
+                4) input "exit" or ":q" to quit the loop;
+            '''
+        ).replace(' -\n    ', ' ').rstrip(), ':v1')
+        
+        timing = _LoopTiming() if config.FUNC_LOOP_SHOW_TIMING else None
+        if timing:
+            timing.add(elapsed)
+            print(':v1', timing.last())
+        if config.FUNC_LOOP_HOT_RELOAD:
+            from .reload import get_mtime, reload_func
+            mtime = get_mtime(func)
+        
+        while True:
+            try:
+                cmd = input('[argsense] input command here: ').strip()
+            except (EOFError, KeyboardInterrupt):
+                break
+            if cmd == 'exit' or cmd == ':q':
+                break
+            
+            reloaded = False
+            # noinspection PyUnboundLocalVariable
+            if config.FUNC_LOOP_HOT_RELOAD and (
+                (new_mtime := get_mtime(func)) != mtime
+            ):
+                mtime = new_mtime
+                try:
+                    # noinspection PyUnboundLocalVariable
+                    func = reload_func(self, func)
+                except Exception as e:
+                    print(':e', e)  # the old function is kept.
+                else:
+                    print(':v2', 'source changed, reloaded')
+                    reloaded = True
+            
+            if cmd == '':
+                # if reloaded, the signature may change, parse the last-time -
+                # args again.
+                new_argv, new_mode = (argv if reloaded else None), mode
+            elif cmd == '_':
+                new_argv, new_mode = Argv.from_sys_argv(), mode
+            else:
+                try:
+                    new_argv = Argv(
+                        argv.launcher, argv.target, tuple(parse_argstring(cmd))
+                    )
+                except ArgvParsingFailed as e:  # a bad response file.
+                    print(':v4', str(e))
+                    continue
+                except Exception as e:
+                    print(':e', e)
+                    continue
+                new_mode = 'command'
+            
+            if new_argv is not None:
+                try:
+                    result = parse_argv(
+                        new_argv,
+                        mode=new_mode,
+                        front_matter=self.get_func_info(func).front_matter,
+                        raise_error=True,
+                    )
+                except ArgvParsingFailed as e:
+                    print(':v4', str(e))
+                    continue
+                if ':help' in result['kwargs']:
+                    from . import renderer
+                    renderer.render_function_parameters(
+                        new_argv,
+                        self.get_func_info(func),
+                        show_func_name_in_title=new_mode == 'group',
+                    )
+                    continue
+                result['kwargs'].pop(':loop', None)
+                output_format = _pop_output_format(result['kwargs'])
+                args, kwargs = tuple(result['args'].values()), result['kwargs']
+                argv, mode = new_argv, new_mode
+            
+            start = perf_counter()
+            try:
+                out = self._emit(
+                    self._call(func, args, kwargs, output_format),
+                    output_format,
+                )
+            except KeyboardInterrupt:
+                print(':v4', 'interrupted')
+                continue
+            except Exception as e:
+                print(':e', e)
+                continue
+            if timing:
+                timing.add(perf_counter() - start)
+                print(':v1', timing.last())
+        
+        if timing and timing.count > 1:
+            print(':v1', timing.summary())
+        return out
+
+
+def _pop_output_format(kwargs: t.Dict[str, t.Any]) -> str:
+    """
+    pop the output special args (`:json`, `:ndjson`, `:msgpack`) from parsed -
+    kwargs, the last one wins. see `./output.py`.
+    """
+    out = config.OUTPUT_FORMAT
+    for x in tuple(kwargs):
+        if x in (':json', ':msgpack', ':ndjson'):
+            kwargs.pop(x)
+            out = x[1:]
+    return out
+
+
+class _LoopTiming:
+    """
+    running statistics of func-loop runs, see `config.FUNC_LOOP_SHOW_TIMING`.
+    only aggregates are kept, so memory does not grow with the number of runs.
+    """
+    __slots__ = ('count', 'total', 'min', 'max', 'latest')
+    
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.latest = 0.0
+    
+    def add(self, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        self.min = min(self.min, elapsed)
+        self.max = max(self.max, elapsed)
+        self.latest = elapsed
+    
+    def last(self) -> str:
+        return 'run #{} took {} (mean {})'.format(
+            self.count,
+            _format_duration(self.latest),
+            _format_duration(self.total / self.count),
+        )
+    
+    def summary(self) -> str:
+        return '{} runs, total {}, mean {}, min {}, max {}'.format(
+            self.count,
+            _format_duration(self.total),
+            _format_duration(self.total / self.count),
+            _format_duration(self.min),
+            _format_duration(self.max),
+        )
+
+
+def _format_duration(seconds: float) -> str:
+    if seconds >= 1:
+        return '{:.3f} s'.format(seconds)
+    if seconds >= 1e-3:
+        return '{:.3f} ms'.format(seconds * 1e3)
+    return '{:.1f} us'.format(seconds * 1e6)
 
 
 cli = CommandLineInterface(name='argsense-cli')
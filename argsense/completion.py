@@ -0,0 +1,384 @@
+"""
+shell completion for bash, zsh and fish.
+
+the commands and options of a target are serialized into a compact json index -
+in cache dir, once at install time. the shell asks this module for candidates -
+on each tab press, it is executed as a plain file (without importing argsense -
+or the target) and answers from the index in a few milliseconds. if the -
+target's source file changes, the index is rebuilt on the next query.
+
+usage:
+    # generate the completion script (and the index) for 'mytool.py', which -
+    # is invoked as `mytool` in shell:
+    python -m argsense.completion script mytool.py --shell bash --prog mytool
+    #   then save the output to where your shell loads completions, e.g.:
+    #       bash: ~/.local/share/bash-completion/completions/mytool
+    #       zsh : a file named '_mytool' in one of `$fpath`
+    #       fish: ~/.config/fish/completions/mytool.fish
+    
+    # for a single entrance tool (`cli.run(main)`), specify the function:
+    python -m argsense.completion script mytool.py --func main
+    
+    # rebuild the index manually:
+    python -m argsense.completion index mytool.py
+    
+    or generate from code:
+        cli.completion_script('zsh', prog='mytool')
+
+index:
+    {
+        'schema'  : 1,
+        'source'  : str,  # abspath of target.
+        'mtime'   : int,  # st_mtime_ns of target.
+        'entry'   : str | None,  # the preset command of a single entrance.
+        'commands': {
+            cmd_name: {
+                'options': [str, ...],  # cnames and shorts that take a value.
+                'flags'  : [str, ...],  # cnames and shorts of flags.
+            }, ...
+        },
+        'specials': [str, ...],  # special args, e.g. ':help', ':loop'.
+    }
+    a negation (`--no-xxx`, `--not-xxx`, `--!xxx`) is not stored, it is -
+    derived from the long name of a flag at query time.
+"""
+import json
+import os
+import sys
+import typing as t
+#   hashlib and re are imported in place, they are not needed by `query`, -
+#   which runs on every tab press.
+
+if __package__:
+    from .cache_dir import get_cache_dir
+    from .cache_dir import make_cache_dir
+else:  # executed as a plain file, see the bottom of this module.
+    from cache_dir import get_cache_dir
+    from cache_dir import make_cache_dir
+
+if t.TYPE_CHECKING:
+    from .cli import CommandLineInterface
+
+_SCHEMA = 1
+
+
+class T:
+    Index = t.TypedDict('Index', {
+        'schema'  : int,
+        'source'  : str,
+        'mtime'   : int,
+        'entry'   : t.Optional[str],
+        'commands': t.Dict[str, t.Dict[str, t.List[str]]],
+        'specials': t.List[str],
+    })
+    Shell = t.Literal['bash', 'fish', 'zsh']
+
+
+def get_index_path(target: str, func: str = None) -> str:
+    import hashlib
+    key = '{}:{}'.format(os.path.abspath(target), func or '')
+    return os.path.join(get_cache_dir(), 'completion-{}.json'.format(
+        hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    ))
+
+
+# -----------------------------------------------------------------------------
+# build
+
+def build_index(
+    cli: 'CommandLineInterface', target: str, func: t.Callable = None
+) -> T.Index:
+    """
+    params:
+        target: the script path that defines the commands.
+        func: the preset function of a single entrance tool.
+    """
+    from .converter import SPECIAL_ARGS
+    from .parser import ParamType
+    
+    if func:
+        cli.get_func_info(func)
+        entries = [(func, cli._registry[id(func)][1])]
+    else:
+        entries = [(f, n) for f, n, _ in cli._registry.values()]
+    
+    commands = {}
+    for f, cmd_name in entries:
+        front_matter = cli.get_func_info(f).front_matter
+        types = {**front_matter['args'], **front_matter['kwargs']}
+        options, flags = [], []
+        for cname, name in front_matter['index'].items():
+            if not cname.startswith('-'):
+                continue
+            if types.get(name) == ParamType.FLAG:
+                flags.append(cname)
+            else:
+                options.append(cname)
+        commands[cmd_name] = {'options': options, 'flags': flags}
+    
+    target = os.path.abspath(target)
+    return {
+        'schema'  : _SCHEMA,
+        'source'  : target,
+        'mtime'   : os.stat(target).st_mtime_ns,
+        'entry'   : entries[0][1] if func else None,
+        'commands': commands,
+        'specials': sorted(SPECIAL_ARGS),
+    }
+
+
+def save_index(index: T.Index, path: str) -> None:
+    make_cache_dir(os.path.dirname(path))
+    temp = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temp, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    os.replace(temp, path)
+
+
+def get_script(
+    shell: T.Shell, prog: str, index_path: str, python: str = None
+) -> str:
+    """
+    the completion script of `prog` for `shell`.
+    
+    params:
+        prog: the command name that user types in shell.
+        python: the interpreter to answer queries, defaults to current one.
+    """
+    # `-S` skips importing site, the query needs only the standard library.
+    query = '"{}" -S "{}" query "{}"'.format(
+        python or sys.executable, os.path.abspath(__file__), index_path
+    )
+    import re
+    ident = re.sub(r'\W', '_', prog)
+    if shell == 'bash':
+        # pass the line instead of `COMP_WORDS`, since bash splits words -
+        # at ':' (see `COMP_WORDBREAKS`).
+        return _BASH_TEMPLATE.format(prog=prog, ident=ident, query=query)
+    elif shell == 'zsh':
+        return _ZSH_TEMPLATE.format(prog=prog, ident=ident, query=query)
+    elif shell == 'fish':
+        return _FISH_TEMPLATE.format(prog=prog, ident=ident, query=query)
+    else:
+        raise ValueError('unsupported shell: {}'.format(shell))
+
+
+_BASH_TEMPLATE = '''\
+# bash completion for {prog}, generated by argsense.
+_argsense_complete_{ident}() {{
+    local IFS=$'\\n'
+    COMPREPLY=($({query} --line "${{COMP_LINE:0:COMP_POINT}}" 2>/dev/null))
+    if [ ${{#COMPREPLY[@]}} -eq 0 ]; then
+        compopt -o default 2>/dev/null
+    fi
+}}
+complete -F _argsense_complete_{ident} {prog}
+'''
+
+_ZSH_TEMPLATE = '''\
+#compdef {prog}
+# zsh completion for {prog}, generated by argsense.
+_argsense_complete_{ident}() {{
+    local -a candidates
+    candidates=("${{(@f)$({query} "${{(@)words[2,CURRENT]}}" 2>/dev/null)}}")
+    if [[ -n "${{candidates[1]}}" ]]; then
+        compadd -- "${{candidates[@]}}"
+    else
+        _files
+    fi
+}}
+if [[ "${{zsh_eval_context[-1]}}" == loadautofunc ]]; then
+    _argsense_complete_{ident} "$@"  # autoloaded from `$fpath`.
+else
+    compdef _argsense_complete_{ident} {prog}  # sourced.
+fi
+'''
+
+_FISH_TEMPLATE = '''\
+# fish completion for {prog}, generated by argsense.
+function __argsense_complete_{ident}
+    set -l words (commandline -opc) (commandline -ct)
+    {query} $words[2..-1] 2>/dev/null
+end
+complete -c {prog} -f -a '(__argsense_complete_{ident})'
+'''
+
+
+# -----------------------------------------------------------------------------
+# query
+
+def query(index_path: str, words: t.Sequence[str]) -> t.List[str]:
+    """
+    params:
+        words: the words after the program name, the last one is the word -
+            under cursor (can be empty).
+    returns:
+        candidates that start with the word under cursor. an empty list -
+        means "no suggestion", the shell falls back to complete file paths.
+    """
+    index = _load_index(index_path)
+    if index is None:
+        return []
+    
+    current = words[-1] if words else ''
+    previous = words[:-1]
+    
+    command = index['entry']
+    if command is None:
+        command = next((w for w in previous if w in index['commands']), None)
+    info = index['commands'].get(command) if command else None
+    
+    if info and previous and previous[-1] in info['options']:
+        return []  # the word is an option value.
+    
+    if current.startswith(':'):
+        candidates = index['specials']
+    elif current.startswith('-'):
+        if info is None:
+            candidates = ['--help', '-h']
+        else:
+            candidates = info['options'] + info['flags']
+            for prefix in ('--no-', '--not-', '--!'):
+                # '--not-' and '--!' are listed only if user starts typing -
+                # them, otherwise they bloat the list.
+                if prefix == '--no-' or current.startswith(prefix.rstrip('-')):
+                    candidates += [
+                        prefix + x[2:] for x in info['flags']
+                        if x.startswith('--') and x != '--help'
+                    ]
+    elif info is None:
+        candidates = list(index['commands'])
+    else:
+        candidates = []
+    return [x for x in candidates if x.startswith(current)]
+
+
+def _load_index(index_path: str) -> t.Optional[T.Index]:
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index: T.Index = json.load(f)
+        assert index['schema'] == _SCHEMA
+    except Exception:
+        return None
+    try:
+        mtime = os.stat(index['source']).st_mtime_ns
+    except OSError:
+        return index
+    if mtime != index['mtime']:
+        # the source is changed, rebuild the index in a child process which -
+        # imports argsense and the target.
+        import subprocess
+        args = [sys.executable, os.path.abspath(__file__), 'index']
+        args.append(index['source'])
+        if index['entry']:
+            args.extend(('--func', index['entry']))
+        args.extend(('--output', index_path))
+        subprocess.run(
+            args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except Exception:
+            return None
+    return index
+
+
+def _split_line(line: str) -> t.List[str]:
+    """
+    split a command line (the part before cursor) into words, and drop the -
+    program name. if the line ends with a space, the word under cursor is -
+    empty.
+    """
+    import shlex
+    lexer = shlex.shlex(line, posix=True)
+    lexer.whitespace_split = True
+    words = []
+    try:
+        for word in lexer:
+            words.append(word)
+    except ValueError:  # unclosed quotation, take the rest as one word.
+        words.append(lexer.token)
+    if not line or line[-1].isspace():
+        words.append('')
+    return words[1:]
+
+
+# -----------------------------------------------------------------------------
+
+def _load_target(target: str) -> 'CommandLineInterface':
+    import runpy
+    from .cli import CommandLineInterface
+    sys.argv = [target]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(target)))
+    namespace = runpy.run_path(target, run_name='__argsense_completion__')
+    #   a name other than '__main__', so that `cli.run()` at the bottom of -
+    #   target is not triggered.
+    for v in namespace.values():
+        if isinstance(v, CommandLineInterface) and v._registry:
+            return v
+    raise RuntimeError('no command found in ' + target)
+
+
+def _main() -> None:
+    usage = (
+        'usage:\n'
+        '    python -m argsense.completion script <target> '
+        '[--shell bash|zsh|fish] [--prog <name>] [--func <name>]\n'
+        '    python -m argsense.completion index <target> '
+        '[--func <name>] [--output <path>]\n'
+        '    python -m argsense.completion query <index> '
+        '(--line <line> | <words> ...)'
+    )
+    if len(sys.argv) < 3 or sys.argv[1] not in ('index', 'query', 'script'):
+        print(usage, file=sys.stderr)
+        sys.exit(2)
+    action, args = sys.argv[1], sys.argv[2:]
+    
+    if action == 'query':
+        if args[1:2] == ['--line']:
+            words = _split_line(args[2] if len(args) > 2 else '')
+        else:
+            words = args[1:]
+        candidates = query(args[0], words)
+        if words and ':' in words[-1] and '--line' in args:
+            # bash completes only the part after the last ':', see -
+            # `_BASH_TEMPLATE`.
+            cut = words[-1].rindex(':') + 1
+            candidates = [x[cut:] for x in candidates]
+        if candidates:
+            sys.stdout.write('\n'.join(candidates) + '\n')
+        return
+    
+    target, options = args[0], {'--shell': 'bash', '--func': None}
+    for k, v in zip(args[1::2], args[2::2]):
+        if k not in ('--func', '--output', '--prog', '--shell'):
+            print(usage, file=sys.stderr)
+            sys.exit(2)
+        options[k] = v
+    
+    cli = _load_target(target)
+    func = options['--func'] and cli._cname_2_func[options['--func']]
+    index_path = options.get('--output') or get_index_path(
+        target, options['--func']
+    )
+    save_index(build_index(cli, target, func), index_path)
+    if action == 'script':
+        sys.stdout.write(get_script(
+            options['--shell'],
+            options.get('--prog') or os.path.splitext(
+                os.path.basename(target)
+            )[0],
+            index_path,
+        ))
+
+
+if __name__ == '__main__':
+    if not __package__:
+        # executed as a plain file (by the completion scripts), the argsense -
+        # package is not imported, which makes the query fast. building the -
+        # index still needs it.
+        sys.path.pop(0)  # the package dir, do not let it shadow others.
+        if sys.argv[1:2] != ['query']:
+            from argsense.completion import _main
+    _main()
@@ -9,7 +9,7 @@ TODO:
 """
 import typing as t
 
-from rich import get_console
+from .cache_dir import get_cache_dir
 
 
 class T:
@@ -17,6 +17,8 @@ class T:
         'AAA_BBB', 'AAA-BBB', 'aaa_bbb', 'aaa-bbb', 'AaaBbb'
     ]
     FallbackType = t.Literal['any', 'str']
+    OutputFormat = t.Literal['', 'json', 'msgpack', 'ndjson']
+    ParallelExecutor = t.Literal['thread', 'process']
     OverwrittenScheme = t.Literal['first', 'last']
 
 
@@ -85,7 +87,66 @@ OVERWRITTEN_SCHEME: T.OverwrittenScheme = 'last'
 WARNING_IF_RUNNING_ON_PYCHARM_CONSOLE = False
 CONSOLE_WIDTH: int = 120
 
+# cache
+USE_CACHE = False
+#   cache parsed func info on disk, see [./cache.py]. it is opt-in, the -
+#   cache files are loaded with pickle.
+#   it can also be disabled by environment variable `ARGSENSE_NO_CACHE=1`.
+CACHE_DIR: str = get_cache_dir()
+#   a new dir is created private to current user (0700).
+
+# batch mode
+PARALLEL_EXECUTOR: T.ParallelExecutor = 'thread'
+PARALLEL_FAIL_FAST = False
+PARALLEL_MAX_WORKERS = 0
+#   0 means the default of `concurrent.futures`.
+PARALLEL_ORDERED = True
+PARALLEL_TIMEOUT: float = 0
+#   seconds per task, 0 means no limit.
+#   the options above are used by `:parallel` special arg, see [./batch.py : -
+#   def exec_parallel()] for details.
+
 # other
+EXPAND_RESPONSE_FILES = False
+#   expand an arg like `@args.txt` to the args written in that file. see -
+#   [./parser/args_parser/argv.py : class Argv].
+#   it is opt-in, otherwise a literal value starting with '@' (e.g. a user -
+#   handle) would be read as a file path.
+FUNC_LOOP_HOT_RELOAD = False
+#   in func-loop mode (`:loop`), if the source file of the command is -
+#   changed, re-execute its module and use the new function for the next -
+#   run. it is opt-in, because re-executing the module runs its top-level -
+#   code (side effects included) again. see [./reload.py].
+FUNC_LOOP_SHOW_TIMING = False
+#   in func-loop mode (`:loop`), print the elapsed time of each run, and a -
+#   summary (count, total, mean, min, max) when the loop quits.
+LAZY_REGISTRATION = False
+#   if true, `CommandLineInterface.add_cmd` defers parsing function signature -
+#   and docstring until the command is dispatched or its help is rendered.
+#   see also [./cli.py : class CommandLineInterface : def __init__()]
+OUTPUT_FORMAT: T.OutputFormat = ''
+#   write the return value of dispatched command to stdout in this format, -
+#   '' means not to write. it can be overridden per call by special arg -
+#   `:json`, `:ndjson` or `:msgpack`. see [./output.py].
+REUSE_RUNNING_LOOP = True
+#   when an async command is called while an event loop is already running -
+#   in current thread, if true, schedule it on that loop and return the task; -
+#   if false, run it in a helper thread and wait for the result.
+#   see [./aio.py : def run_coroutine()].
+SETUP_LK_LOGGER_ON_DISPATCH = False
+#   call `lk_logger.setup(quiet=True)` right before a command is dispatched, -
+#   so that `print` in the command supports lk_logger markers (e.g. ':v4'), -
+#   as argsense did on import before. it imports rich as well, so it is -
+#   opt-in. it has no effect in batch mode, where prints are captured. see -
+#   [./console.py].
+STREAM_BUFFER_SIZE = 1 << 16
+STREAM_FLUSH_INTERVAL: float = 0.1
+#   when a command returns a generator (or an async generator), its elements -
+#   are written to stdout as they are produced. the output is buffered up to -
+#   `STREAM_BUFFER_SIZE` characters (bytes for msgpack) or -
+#   `STREAM_FLUSH_INTERVAL` seconds. see [./output.py : def stream_output()].
+STREAM_SHOW_PROGRESS = False
+#   show the count and throughput of streamed elements in stderr.
 WARN_IF_DUPLICATE_COMMANDS_OVERRIDDEN = False
 
 
@@ -96,6 +157,9 @@ class Dynamic:
 
 
 def apply_changes():  # TODO: rename to 'finalize'?
+    # note: this is called by `./console.py : def setup()`, right before -
+    # the first time rich console is used.
+    from rich import get_console
     console = get_console()
     if CONSOLE_WIDTH == 0:
         rulers = (80, 100, 120, 200)
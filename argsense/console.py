@@ -0,0 +1,108 @@
+"""
+deferred setup of lk_logger and rich.
+
+both of them are heavy to import (lk_logger loads rich as well), so argsense -
+does not touch them until it is going to print something by itself, i.e. -
+help interface, error panel, warnings or func-loop prompts. a command that is -
+dispatched with valid args never imports them, unless -
+`config.SETUP_LK_LOGGER_ON_DISPATCH` is enabled.
+
+note: lk_logger replaces `print` once it is imported, its print writes in a -
+background thread and always to stdout (the `file` argument is ignored). -
+where the prints of a command must be captured or redirected, use -
+`plain_print`.
+"""
+import builtins
+import sys
+import threading
+import typing as t
+from contextlib import contextmanager
+
+_is_ready = False
+_plain_print_depth = 0
+_plain_print_lock = threading.Lock()
+_saved_print: t.Optional[t.Callable] = None
+
+
+def setup() -> None:
+    global _is_ready
+    if _is_ready:
+        return
+    _is_ready = True
+    
+    import lk_logger
+    lk_logger.setup(quiet=True)
+    
+    from . import config
+    config.apply_changes()
+
+
+def setup_for_dispatch() -> None:
+    """
+    commands may print with lk_logger markers, which need lk_logger to be -
+    set up. see `config.SETUP_LK_LOGGER_ON_DISPATCH`.
+    """
+    from . import config
+    if config.SETUP_LK_LOGGER_ON_DISPATCH:
+        setup()
+
+
+@contextmanager
+def plain_print() -> t.Iterator[None]:
+    """
+    use the builtin `print` in the context, if lk_logger has replaced it. -
+    the messages lk_logger queued before are written out first.
+    it is reentrant and can be used by threads at the same time, the -
+    replaced `print` is restored when the outermost context exits.
+    """
+    global _plain_print_depth, _saved_print
+    if (lk_logger := sys.modules.get('lk_logger')) is None:
+        yield
+        return
+    with _plain_print_lock:
+        if _plain_print_depth == 0:
+            flush()
+            _saved_print = builtins.print
+            builtins.print = lk_logger.bprint
+        _plain_print_depth += 1
+    try:
+        yield
+    finally:
+        with _plain_print_lock:
+            _plain_print_depth -= 1
+            if _plain_print_depth == 0:
+                builtins.print = _saved_print
+                _saved_print = None
+
+
+def flush() -> None:
+    """
+    wait for lk_logger (if it is imported) to write out its queued messages.
+    """
+    if (lk_logger := sys.modules.get('lk_logger')) is not None:
+        lk_logger.logger.log(':f0s')  # flush, print nothing.
+
+
+def after_fork() -> None:
+    """
+    call it in a forked child process. lk_logger's background thread is not -
+    copied by fork, the messages it queued would never be written, so it -
+    prints synchronously in the child. the messages queued before fork are -
+    left to the parent.
+    """
+    if (lk_logger := sys.modules.get('lk_logger')) is not None:
+        # noinspection PyProtectedMember
+        lk_logger.logger._message_queue.clear()
+        lk_logger.update(subthreaded=False)
+
+
+def stop() -> None:
+    """
+    write out lk_logger's queued messages and stop its background thread, -
+    as lk_logger does at exit. for a process exiting by `os._exit`, which -
+    skips the exit handlers.
+    """
+    if (lk_logger := sys.modules.get('lk_logger')) is not None:
+        # noinspection PyProtectedMember
+        if stop_running := getattr(lk_logger.logger, '_stop_running', None):
+            stop_running()  # it is registered by lk_logger in `atexit`.
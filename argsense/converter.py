@@ -1,3 +1,4 @@
+import json
 import os
 import re
 import typing as t
@@ -5,12 +6,15 @@ import typing as t
 from . import config
 from .parser.args_parser import ParamType
 from .parser.func_parser import T as T0
+from .streams import Stream
+from .streams import open_stream
 
 
 class T:
     ParamType1 = T0.PlainParamType  # literal
     ParamType2 = ParamType  # enum
     ParamType3 = t.Type  # type
+    ContainerSpec = T0.ContainerSpec
     Style = t.Literal['grp', 'cmd', 'arg', 'opt', 'ext']
 
 
@@ -106,17 +110,20 @@ def type_2_ctype(type_: T.ParamType1) -> T.ParamType2:
         to: `./argparse/parser.py : def parse_sys_argv()`
     """
     return {
-        'any'  : ParamType.ANY,
-        # 'bool' : ParamType.BOOL,
-        'dict' : ParamType.DICT,
-        'flag' : ParamType.FLAG,
-        'float': ParamType.NUMBER,
-        'int'  : ParamType.NUMBER,
-        'list' : ParamType.LIST,
-        'none' : ParamType.NONE,
-        'set'  : ParamType.LIST,
-        'str'  : ParamType.TEXT,
-        'tuple': ParamType.LIST,
+        'any'   : ParamType.ANY,
+        # 'bool'  : ParamType.BOOL,
+        'chunks': ParamType.STREAM,
+        'dict'  : ParamType.DICT,
+        'flag'  : ParamType.FLAG,
+        'float' : ParamType.NUMBER,
+        'int'   : ParamType.NUMBER,
+        'lines' : ParamType.STREAM,
+        'list'  : ParamType.LIST,
+        'mapped': ParamType.STREAM,
+        'none'  : ParamType.NONE,
+        'set'   : ParamType.LIST,
+        'str'   : ParamType.TEXT,
+        'tuple' : ParamType.LIST,
     }.get(type_, ParamType.ANY)
 
 
@@ -141,6 +148,10 @@ def val_2_cval(value: t.Any, type_: ParamType = ParamType.ANY) -> str:
                 return '""'
             else:
                 return value
+        if isinstance(value, (dict, frozenset, list, set, tuple)):
+            return _container_2_cval(value)
+        if isinstance(value, Stream):
+            return value.path
         if type_ in (ParamType.ANY, ParamType.NUMBER):
             assert isinstance(value, (int, float))
             return str(value)
@@ -150,6 +161,32 @@ def val_2_cval(value: t.Any, type_: ParamType = ParamType.ANY) -> str:
             raise NotImplementedError(value, type_)
 
 
+def _container_2_cval(value: t.Union[dict, list, set, tuple]) -> str:
+    """
+    the comma separated form (e.g. '1,2,3', 'a=1,b=2') if every element is a -
+    plain number or a plain text, otherwise the json form.
+    see also `decode_container`.
+    """
+    def is_plain(x: t.Any) -> bool:
+        if isinstance(x, str):
+            return bool(x) and not any(c in x for c in ',=[]{}"')
+        return isinstance(x, (int, float)) and not isinstance(x, bool)
+    
+    if isinstance(value, dict):
+        if value and all(map(is_plain, value)) and all(
+            map(is_plain, value.values())
+        ):
+            return ','.join('{}={}'.format(k, v) for k, v in value.items())
+    else:
+        value = list(value)
+        if value and all(map(is_plain, value)):
+            return ','.join(map(str, value))
+    try:
+        return json.dumps(value)
+    except TypeError:
+        return str(value)
+
+
 # -----------------------------------------------------------------------------
 
 def cname_2_name(name: str) -> str:
@@ -169,7 +206,7 @@ def ctype_2_type(t: T.ParamType2, v: t.Any = None) -> T.ParamType3:
         if v is None or (isinstance(v, str) and v.isdigit()):
             return int
         return float
-    elif t == ParamType.TEXT:
+    elif t in (ParamType.STREAM, ParamType.TEXT):
         return str
     else:
         raise NotImplementedError
@@ -184,7 +221,25 @@ PYTHON_ACCEPTABLE_NUMBER_PATTERN = re.compile(
     r') *$'
 )
 
+
+def decode_number(value: str) -> t.Union[int, float]:
+    """
+    decode a number matched by `PYTHON_ACCEPTABLE_NUMBER_PATTERN`, without -
+    `eval`. the result is the same as `eval(value)`, except that decimal -
+    integers with leading zeros (e.g. '007') are accepted.
+    """
+    if value.isdigit():
+        return int(value)
+    value = value.strip()
+    if '.' in value:
+        return float(value)
+    if 'b' in value or 'x' in value:
+        return int(value, 0)  # '0b' or '0x' form, with optional '-'.
+    return int(value)
+
+
 SPECIAL_ARGS = {
+    ':batch'      : True,
     ':cwd'        : os.getcwd(),
     ':empty'      : '',
     ':f'          : False,  # alias of ':false'
@@ -193,21 +248,37 @@ SPECIAL_ARGS = {
     ':help'       : True,
     # ':i'          : True,  # alias of ':interactive'
     # ':interactive': True,
+    ':json'       : True,
     ':loop'       : True,
+    ':msgpack'    : True,
+    ':ndjson'     : True,
     ':none'       : None,
+    ':parallel'   : True,
     ':t'          : True,  # alias of ':true'
     ':true'       : True,
 }
 
 
-def cval_2_val(value: str, type_: ParamType) -> t.Any:
+def cval_2_val(
+    value: str,
+    type_: ParamType,
+    spec: t.Union[T.ContainerSpec, str] = None,
+) -> t.Any:
+    """
+    params:
+        spec:
+            for `ParamType.LIST` and `ParamType.DICT`: element types, see -
+            `FuncInfo.containers`. if not given, elements are 'any'.
+            for `ParamType.STREAM`: the stream kind, see -
+            `FuncInfo.streams`. if not given, it is 'lines'.
+    """
     # print(':v', arg, type(arg), type, type(type))
     if value in SPECIAL_ARGS:
         return SPECIAL_ARGS[value]
     
     if type_ == ParamType.ANY:
         if PYTHON_ACCEPTABLE_NUMBER_PATTERN.match(value):
-            return eval(value)
+            return decode_number(value)
         else:
             return value
     # elif type_ == ParamType.BOOL:
@@ -229,8 +300,117 @@ def cval_2_val(value: str, type_: ParamType) -> t.Any:
         return None
     elif type_ == ParamType.NUMBER:
         assert PYTHON_ACCEPTABLE_NUMBER_PATTERN.match(value)
-        return eval(value)
+        return decode_number(value)
     elif type_ == ParamType.TEXT:
         return value
+    elif type_ == ParamType.LIST:
+        return decode_container(value, spec or ('list', None, 'any'))
+    elif type_ == ParamType.DICT:
+        return decode_container(value, spec or ('dict', 'any', 'any'))
+    elif type_ == ParamType.STREAM:
+        return open_stream(value, spec or 'lines')
     else:
         raise NotImplementedError(value, type_)
+
+
+def decode_container(
+    value: str, spec: T.ContainerSpec
+) -> t.Union[dict, list, set, tuple]:
+    """
+    decode a list/set/tuple/dict param from one command line value, which -
+    can be:
+        - comma separated: '1,2,3', or 'a=1,b=2' for dict.
+        - json: '[1, 2, 3]', '{"a": 1, "b": 2}'.
+        - empty: an empty container.
+    elements are converted in one pass by the types in `spec`.
+    raises AssertionError if the value is malformed.
+    """
+    kind, key_type, item_type = spec
+    if value[:1] in ('[', '{'):
+        try:
+            data = json.loads(value)
+        except ValueError:
+            raise AssertionError('invalid json', value)
+        if kind == 'dict':
+            assert isinstance(data, dict), ('expect a json object', value)
+            return dict(zip(
+                _convert_items(list(data), key_type, is_text=True),
+                _convert_items(list(data.values()), item_type, is_text=False),
+            ))
+        assert isinstance(data, list), ('expect a json array', value)
+        items = _convert_items(data, item_type, is_text=False)
+    elif kind == 'dict':
+        if not value:
+            return {}
+        pairs = [x.split('=', 1) for x in value.split(',')]
+        assert all(len(x) == 2 for x in pairs), ('expect "key=value"', value)
+        keys, values = zip(*pairs)
+        return dict(zip(
+            _convert_items(keys, key_type, is_text=True),
+            _convert_items(values, item_type, is_text=True),
+        ))
+    else:
+        items = _convert_items(
+            value.split(',') if value else [], item_type, is_text=True
+        )
+    if kind == 'list':
+        return items
+    return set(items) if kind == 'set' else tuple(items)
+
+
+def merge_containers(
+    old: t.Union[dict, list, set, tuple], new: t.Union[dict, list, set, tuple]
+) -> t.Union[dict, list, set, tuple]:
+    """ merge values of a repeated option, e.g. `--ids 1,2 --ids 3`. """
+    if isinstance(old, list):
+        old.extend(new)
+        return old
+    if isinstance(old, dict):
+        old.update(new)
+        return old
+    if isinstance(old, set):
+        return old | set(new)
+    return old + tuple(new)
+
+
+def _convert_items(
+    items: t.Sequence[t.Any], type_: T.ParamType1, is_text: bool
+) -> t.List[t.Any]:
+    """
+    params:
+        is_text: items are command line texts, or values decoded from json.
+    """
+    if type_ == 'str':
+        return list(items) if is_text else [
+            x if isinstance(x, str) else json.dumps(x) for x in items
+        ]
+    if type_ in ('float', 'int'):
+        if is_text:
+            try:  # the fast path, `int` and `float` run in C.
+                return list(map(int if type_ == 'int' else float, items))
+            except ValueError:  # e.g. '0x1F', or '1.5' for int.
+                pass
+        out = [
+            x if isinstance(x, (float, int)) and not isinstance(x, bool) else
+            cval_2_val(_as_text(x), ParamType.NUMBER)
+            for x in items
+        ]
+        if type_ == 'float':
+            return list(map(float, out))
+        for x in out:
+            assert isinstance(x, int), ('expect an integer', x)
+        return out
+    if type_ == 'flag':
+        return [
+            x if isinstance(x, bool) else
+            cval_2_val(_as_text(x), ParamType.FLAG)
+            for x in items
+        ]
+    if is_text:
+        return [cval_2_val(x, ParamType.ANY) for x in items]
+    return list(items)
+
+
+def _as_text(x: t.Any) -> str:
+    assert isinstance(x, str), ('incorrect element type', x)
+    return x
@@ -0,0 +1,406 @@
+"""
+persistent daemon mode.
+
+a daemon imports the target once, keeps its commands warm (func info built), -
+and serves each invocation in a forked child process. the client forwards -
+argv, cwd, environment and stdio (as file descriptors) over a unix domain -
+socket, then waits for the exit code. when no daemon is running, the client -
+falls back to running the target in process.
+
+usage:
+    # start a daemon for 'mytool.py' (blocks, ctrl+c to stop):
+    python -m argsense.daemon serve mytool.py
+    # invoke it, same as `python mytool.py <args>`:
+    python -m argsense.daemon run mytool.py <args>
+    # stop the daemon:
+    python -m argsense.daemon stop mytool.py
+    
+    the client can also be executed as a plain file, it then skips importing -
+    the argsense package, which saves some startup time:
+        python "$(python -c 'import argsense.daemon as m; print(m.__file__)')" \
+            run mytool.py <args>
+    
+    or serve from code, for example a single entrance tool:
+        if __name__ == '__main__':
+            if os.getenv('MYTOOL_DAEMON') == '1':
+                cli.serve(main)
+            else:
+                cli.run(main)
+
+protocol:
+    request: one message, sent with `socket.send_fds` along with the -
+        client's stdin, stdout and stderr descriptors.
+            <uint32 length><utf-8 json>
+        the json is:
+            {
+                'action': 'run',  # or 'stop'
+                'argv'  : [launcher, target, args],
+                'cwd'   : str,
+                'env'   : {str: str, ...},
+            }
+    response: three signed int32 in network byte order: the pid of the -
+        worker (or 0), the status, then the exit code of the command. the -
+        status is one of `_DONE`, `_STALE` (the daemon refused the request, -
+        the client should run it in process) and `_STOPPED`. it is separated -
+        from the exit code, so that any code returned by command can not be -
+        taken as a refusal.
+
+limitations:
+    - posix only (requires `os.fork` and `socket.send_fds`).
+    - the target is not reloaded. if its source file changes, the daemon -
+    refuses the next request and exits, the client falls back in process.
+"""
+import hashlib
+import json
+import os
+import socket
+import struct
+import sys
+import typing as t
+
+if __package__:
+    from .cache_dir import get_cache_dir
+    from .cache_dir import make_cache_dir
+else:  # executed as a plain file, see the bottom of this module.
+    from cache_dir import get_cache_dir
+    from cache_dir import make_cache_dir
+
+if t.TYPE_CHECKING:
+    from .cli import CommandLineInterface
+    from .parser import Argv
+
+_DONE = 0
+_STALE = 1
+_STOPPED = 2
+
+
+class T:
+    Address = str
+    Request = t.TypedDict('Request', {
+        'action': t.Literal['run', 'stop'],
+        'argv'  : t.Tuple[t.List[str], t.List[str], t.List[str]],
+        'cwd'   : str,
+        'env'   : t.Dict[str, str],
+    })
+
+
+def is_supported() -> bool:
+    return hasattr(os, 'fork') and hasattr(socket, 'send_fds')
+
+
+def get_address(target: str) -> T.Address:
+    """
+    the default socket path of a target, it is placed in cache dir.
+    """
+    return os.path.join(get_cache_dir(), 'daemon-{}.sock'.format(
+        hashlib.sha1(os.path.abspath(target).encode('utf-8')).hexdigest()[:16]
+    ))
+
+
+# -----------------------------------------------------------------------------
+# client
+
+def connect(
+    argv: t.Sequence[t.Sequence[str]],
+    address: T.Address = None,
+    action: str = 'run',
+) -> t.Optional[int]:
+    """
+    params:
+        argv: (launcher, target, args).
+        address: if not given, use `get_address(target)`.
+    returns:
+        exit code, or None if there is no daemon available.
+    """
+    if not is_supported():
+        return None
+    address = address or get_address(argv[1][0])
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        return None
+    
+    with sock:
+        data = json.dumps({
+            'action': action,
+            'argv'  : [list(x) for x in argv],
+            'cwd'   : os.getcwd(),
+            'env'   : dict(os.environ),
+        }).encode('utf-8')
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            socket.send_fds(
+                sock, [struct.pack('!I', len(data)) + data], [0, 1, 2]
+            )
+            pid = _recv_int(sock)
+        except OSError:
+            return None
+        try:
+            try:
+                status = _recv_int(sock)
+            except KeyboardInterrupt:
+                if pid > 0:
+                    import signal
+                    os.kill(pid, signal.SIGINT)
+                status = _recv_int(sock)
+        except OSError:  # the daemon is killed.
+            return 1
+        if status == _STALE:
+            return None
+        if status == _STOPPED:
+            return 0
+        try:
+            code = _recv_int(sock)
+        except OSError:
+            return 1
+    return code
+
+
+def run(target: str, *args: str, address: T.Address = None) -> int:
+    """
+    run target via daemon, fall back to in-process execution.
+    """
+    argv = (('argsense-daemon', 'run'), (target,), args)
+    if (code := connect(argv, address)) is not None:
+        return code
+    
+    import runpy
+    sys.argv = [target, *args]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(target)))
+    try:
+        runpy.run_path(target, run_name='__main__')
+    except SystemExit as e:
+        return _exit_code(e)
+    return 0
+
+
+# -----------------------------------------------------------------------------
+# server
+
+def serve(
+    cli: 'CommandLineInterface',
+    func: t.Callable = None,
+    address: T.Address = None,
+    target: str = None,
+) -> None:
+    """
+    serve forever, until a 'stop' request or keyboard interrupt.
+    
+    params:
+        func: the preset function, like `cli.run(func)`.
+        address: if not given, use `get_address(target)`.
+        target: the script path that defines the commands. it is used to -
+            derive the default address and to detect source changes. -
+            defaults to `sys.argv[0]`.
+    """
+    if not is_supported():
+        raise RuntimeError('daemon mode is not supported on this platform.')
+    target = os.path.abspath(target or sys.argv[0])
+    address = address or get_address(target)
+    mtime = os.stat(target).st_mtime_ns
+    
+    cli.warm_up()
+    server = _bind(address)
+    try:
+        while True:
+            conn, _ = server.accept()
+            _reap_children()
+            with conn:
+                try:
+                    request, fds = _recv_request(conn)
+                except (OSError, ValueError):
+                    continue
+                if request['action'] == 'stop':
+                    _close_fds(fds)
+                    conn.sendall(struct.pack('!ii', 0, _STOPPED))
+                    break
+                if os.stat(target).st_mtime_ns != mtime:
+                    _close_fds(fds)
+                    conn.sendall(struct.pack('!ii', 0, _STALE))
+                    break
+                sys.stdout.flush()
+                sys.stderr.flush()
+                if os.fork() == 0:
+                    server.close()
+                    _work(cli, func, conn, request, fds)  # never returns.
+                _close_fds(fds)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        if os.path.exists(address):
+            os.remove(address)
+
+
+def _bind(address: T.Address) -> socket.socket:
+    if os.path.exists(address):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(address)
+        except OSError:  # left by a dead daemon.
+            os.remove(address)
+        else:
+            probe.close()
+            raise RuntimeError('a daemon is already serving on ' + address)
+    make_cache_dir(os.path.dirname(address))
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(address)
+    os.chmod(address, 0o600)
+    server.listen(16)
+    return server
+
+
+def _work(
+    cli: 'CommandLineInterface',
+    func: t.Optional[t.Callable],
+    conn: socket.socket,
+    request: T.Request,
+    fds: t.List[int],
+) -> t.NoReturn:
+    from . import console
+    from .parser import Argv
+    
+    console.after_fork()
+    code = 1
+    try:
+        conn.sendall(struct.pack('!i', os.getpid()))
+        for fd, std in zip(fds, (0, 1, 2)):
+            os.dup2(fd, std)
+        _close_fds(fds)
+        os.chdir(request['cwd'])
+        os.environ.clear()
+        os.environ.update(request['env'])
+        launcher, target, args = request['argv']
+        sys.argv = [*target, *args]
+        code = _exec(
+            cli, func, Argv(tuple(launcher), tuple(target), tuple(args))
+        )
+    finally:
+        try:
+            # lk_logger may be set up in this process, it prints in a -
+            # background thread then.
+            console.stop()
+            sys.stdout.flush()
+            sys.stderr.flush()
+        except Exception:
+            pass
+        try:
+            conn.sendall(struct.pack('!ii', _DONE, code))
+        except OSError:
+            pass
+        os._exit(0)
+
+
+def _exec(
+    cli: 'CommandLineInterface', func: t.Optional[t.Callable], argv: 'Argv'
+) -> int:
+    try:
+        cli.exec_argv(argv, preset_func=func)
+    except SystemExit as e:
+        return _exit_code(e)
+    except KeyboardInterrupt:
+        return 130
+    except BaseException:
+        import traceback
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+# -----------------------------------------------------------------------------
+
+def _close_fds(fds: t.Iterable[int]) -> None:
+    for fd in fds:
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+def _exit_code(e: SystemExit) -> int:
+    if e.code is None:
+        return 0
+    if isinstance(e.code, int):
+        return e.code
+    print(e.code, file=sys.stderr)
+    return 1
+
+
+def _reap_children() -> None:
+    try:
+        while os.waitpid(-1, os.WNOHANG)[0]:
+            pass
+    except ChildProcessError:
+        pass
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    out = b''
+    while len(out) < size:
+        if not (chunk := sock.recv(size - len(out))):
+            raise ConnectionError('connection closed')
+        out += chunk
+    return out
+
+
+def _recv_int(sock: socket.socket) -> int:
+    return struct.unpack('!i', _recv_exact(sock, 4))[0]
+
+
+def _recv_request(conn: socket.socket) -> t.Tuple[T.Request, t.List[int]]:
+    data, fds, _, _ = socket.recv_fds(conn, 65536, 3)
+    if len(data) < 4:
+        data += _recv_exact(conn, 4 - len(data))
+    size = struct.unpack('!I', data[:4])[0]
+    data = data[4:]
+    if len(data) < size:
+        data += _recv_exact(conn, size - len(data))
+    return json.loads(data), fds
+
+
+def _main() -> None:
+    usage = 'usage: python -m argsense.daemon (serve|run|stop) <target> ...'
+    if len(sys.argv) < 3 or sys.argv[1] not in ('serve', 'run', 'stop'):
+        print(usage, file=sys.stderr)
+        sys.exit(2)
+    action, target, args = sys.argv[1], sys.argv[2], sys.argv[3:]
+    
+    if action == 'run':
+        sys.exit(run(target, *args))
+    
+    elif action == 'stop':
+        if connect(
+            (('argsense-daemon', 'stop'), (target,), ()), action='stop'
+        ) is None:
+            print('no daemon is running for ' + target, file=sys.stderr)
+            sys.exit(1)
+    
+    else:
+        import runpy
+        from .cli import CommandLineInterface
+        sys.argv = [target, *args]
+        sys.path.insert(0, os.path.dirname(os.path.abspath(target)))
+        namespace = runpy.run_path(target, run_name='__argsense_daemon__')
+        #   a name other than '__main__', so that `cli.run()` at the bottom -
+        #   of target is not triggered.
+        candidates = [
+            v for v in namespace.values()
+            if isinstance(v, CommandLineInterface) and v._registry
+        ]
+        if candidates:
+            serve(candidates[0], target=target)
+        else:
+            raise RuntimeError('no command found in ' + target)
+
+
+if __name__ == '__main__':
+    if not __package__:
+        # executed as a plain file, the argsense package is not imported, -
+        # which makes the client start faster. serving still needs it.
+        sys.path.pop(0)  # the package dir, do not let it shadow others.
+        if sys.argv[1:2] == ['serve']:
+            from argsense.daemon import _main
+    _main()
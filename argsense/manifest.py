@@ -0,0 +1,325 @@
+"""
+static command manifest of a target file, for `argsense <target>`.
+
+the manifest is built from the target's AST, without executing it: the -
+public functions defined at the top level, with their parameters, defaults, -
+annotations (as strings) and docstrings. help can be rendered from stub -
+functions made of the manifest, the target is only executed when a command -
+is actually dispatched. see `../__main__.py : def _execfile`.
+
+a target is not statically resolvable (`build_manifest` returns None) if any -
+public function:
+    - is decorated, since the decorator may change its signature.
+    - has a default value that is not a literal, e.g. `os.getcwd()`.
+    - is defined inside a compound statement (`if`, `try`, ...), or is -
+    rebound or modified (e.g. `foo.__doc__ = ...`) by other statements at -
+    the top level.
+or if a public name imported by `from ... import ...` may be a function, -
+which is listed as a command as well when the target is executed. the name -
+is known not to be a function only if its module is already imported.
+"""
+import ast
+import sys
+import typing as t
+from types import FunctionType
+
+
+class T:
+    ParamKind = t.Literal[
+        'positional', 'var_positional', 'keyword_only', 'var_keyword'
+    ]
+    Param = t.TypedDict('Param', {
+        'name'      : str,
+        'kind'      : ParamKind,
+        'annotation': t.Optional[str],
+        'default'   : t.Any,  # not set if there is no default.
+    }, total=False)
+    Function = t.TypedDict('Function', {
+        'name'     : str,
+        'lineno'   : int,
+        'is_async' : bool,
+        'params'   : t.List[Param],
+        'return'   : t.Optional[str],
+        'docstring': t.Optional[str],
+    })
+    Manifest = t.List[Function]
+
+
+class _NotStatic(Exception):
+    pass
+
+
+def build_manifest(
+    target: str, source: str = None
+) -> t.Optional[T.Manifest]:
+    """
+    params:
+        source: the content of target. read from target if not given.
+    returns:
+        None if target can not be resolved statically.
+    """
+    if source is None:
+        with open(target, 'r', encoding='utf-8') as f:
+            source = f.read()
+    try:
+        tree = ast.parse(source, target)
+    except SyntaxError:
+        return None
+    
+    aliases: t.Dict[str, ast.AST] = {}  # {dotted_name: annotation}
+    functions: t.Dict[str, ast.AST] = {}
+    try:
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                if node.name.startswith('_'):
+                    continue
+                if node.decorator_list:
+                    raise _NotStatic
+                functions.pop(node.name, None)  # keep the definition order.
+                functions[node.name] = node
+                continue
+            _collect_aliases(node, aliases)
+            for name in _get_bound_names(node):
+                if name in functions:
+                    raise _NotStatic
+        return [
+            _parse_function(node, aliases)
+            for node in functions.values()
+        ]
+    except _NotStatic:
+        return None
+
+
+def make_functions(
+    manifest: T.Manifest, filename: str = '<manifest>'
+) -> t.List[FunctionType]:
+    """
+    make stub functions which have the same names, signatures and -
+    docstrings as described in manifest. their bodies do nothing.
+    annotations are strings, see `_normalize_annotation`.
+    """
+    lines = []
+    defaults = []
+    for func in manifest:
+        params = []
+        for p in func['params']:
+            text = {
+                'var_positional': '*',
+                'var_keyword'   : '**',
+            }.get(p['kind'], '') + p['name']
+            if p['annotation']:
+                text += ': {!r}'.format(p['annotation'])
+            if 'default' in p:
+                # pass the value by name, its repr may not be evaluable, -
+                # e.g. `float('inf')`.
+                text += ' = __defaults__[{}]'.format(len(defaults))
+                defaults.append(p['default'])
+            params.append(text)
+        if any(p['kind'] == 'keyword_only' for p in func['params']) and not (
+            any(p['kind'] == 'var_positional' for p in func['params'])
+        ):
+            i = next(
+                i for i, p in enumerate(func['params'])
+                if p['kind'] == 'keyword_only'
+            )
+            params.insert(i, '*')
+        lines.append('{}def {}({}){}: pass'.format(
+            'async ' if func['is_async'] else '',
+            func['name'],
+            ', '.join(params),
+            ' -> {!r}'.format(func['return']) if func['return'] else '',
+        ))
+    
+    namespace = {
+        '__name__'    : '__argsense_manifest__',
+        '__defaults__': defaults,
+    }
+    exec(compile('\n'.join(lines), filename, 'exec'), namespace)
+    out = []
+    for func in manifest:
+        stub = namespace[func['name']]
+        stub.__doc__ = func['docstring']
+        out.append(stub)
+    return out
+
+
+# -----------------------------------------------------------------------------
+
+def _parse_function(
+    node: t.Union[ast.FunctionDef, ast.AsyncFunctionDef],
+    aliases: t.Dict[str, ast.AST],
+) -> T.Function:
+    args = node.args
+    params: t.List[T.Param] = []
+    
+    def add(
+        arg: ast.arg, kind: T.ParamKind, default: ast.AST = None
+    ) -> None:
+        param: T.Param = {
+            'name'      : arg.arg,
+            'kind'      : kind,
+            'annotation': _normalize_annotation(arg.annotation, aliases),
+        }
+        if default is not None:
+            try:
+                param['default'] = ast.literal_eval(default)
+            except ValueError:
+                raise _NotStatic
+        params.append(param)
+    
+    positional = getattr(args, 'posonlyargs', []) + args.args
+    defaults = [None] * (len(positional) - len(args.defaults)) + args.defaults
+    for arg, default in zip(positional, defaults):
+        add(arg, 'positional', default)
+    if args.vararg:
+        add(args.vararg, 'var_positional')
+    for arg, default in zip(args.kwonlyargs, args.kw_defaults):
+        add(arg, 'keyword_only', default)
+    if args.kwarg:
+        add(args.kwarg, 'var_keyword')
+    
+    return {
+        'name'     : node.name,
+        'lineno'   : node.lineno,
+        'is_async' : isinstance(node, ast.AsyncFunctionDef),
+        'params'   : params,
+        'return'   : _normalize_annotation(node.returns, aliases),
+        'docstring': ast.get_docstring(node, clean=False),
+    }
+
+
+def _normalize_annotation(
+    node: t.Optional[ast.AST], aliases: t.Dict[str, ast.AST], depth: int = 0
+) -> t.Optional[str]:
+    """
+    simplify an annotation to the name that `func_parser.Annotations` -
+    resolves to the same param type as the evaluated annotation does. e.g.
+        int                     -> 'int'
+        t.List[int]             -> 'List'
+        t.Optional[str]         -> 'str'
+        'float'                 -> 'float'
+        MyDict (a TypedDict)    -> 'dict'
+        T.Path (`Path = str`)   -> 'str'
+    """
+    if node is None:
+        return None
+    if depth > 8:  # e.g. a recursive alias.
+        return 'any'
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        try:
+            node = ast.parse(node.value, mode='eval').body
+        except SyntaxError:
+            return 'any'
+    if isinstance(node, ast.Constant) and node.value is None:
+        return 'None'
+    if isinstance(node, ast.Subscript):
+        name = _get_type_name(node.value)
+        if name in ('Optional', 'Union'):
+            index = node.slice
+            if isinstance(index, ast.Index):  # python 3.8
+                index = index.value  # noqa
+            if isinstance(index, ast.Tuple):
+                index = index.elts[0]
+            return _normalize_annotation(index, aliases, depth + 1)
+        return name or 'any'
+    if isinstance(node, ast.Call):  # e.g. `t.TypedDict('Foo', {...})`
+        return {
+            'NamedTuple': 'tuple', 'TypedDict': 'dict'
+        }.get(_get_type_name(node.func), 'any')
+    if (dotted := _get_dotted_name(node)) in aliases:
+        return _normalize_annotation(aliases[dotted], aliases, depth + 1)
+    return _get_type_name(node) or 'any'
+
+
+def _collect_aliases(node: ast.AST, aliases: t.Dict[str, ast.AST]) -> None:
+    """
+    record type aliases defined by a top level statement, including the -
+    ones in a class body (like `class T: Path = str`, referred as `T.Path`).
+    """
+    if isinstance(node, ast.ImportFrom):  # e.g. `from x import Lines as L`
+        for alias in node.names:
+            if alias.asname and alias.name != '*':
+                aliases[alias.asname] = ast.Name(id=alias.name, ctx=ast.Load())
+    elif isinstance(node, ast.Assign) and len(node.targets) == 1:
+        if isinstance(node.targets[0], ast.Name):
+            aliases[node.targets[0].id] = node.value
+    elif isinstance(node, ast.AnnAssign) and node.value is not None:
+        if isinstance(node.target, ast.Name):
+            aliases[node.target.id] = node.value
+    elif isinstance(node, ast.ClassDef):
+        for base in map(_get_type_name, node.bases):
+            if base in ('NamedTuple', 'TypedDict'):
+                aliases[node.name] = ast.Name(
+                    id='tuple' if base == 'NamedTuple' else 'dict',
+                    ctx=ast.Load(),
+                )
+                return
+        for child in node.body:
+            scoped = {}
+            _collect_aliases(child, scoped)
+            for k, v in scoped.items():
+                aliases['{}.{}'.format(node.name, k)] = v
+
+
+def _get_dotted_name(node: ast.AST) -> t.Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        if prefix := _get_dotted_name(node.value):
+            return '{}.{}'.format(prefix, node.attr)
+    return None
+
+
+def _get_type_name(node: ast.AST) -> t.Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):  # e.g. `t.List` -> 'List'
+        return node.attr
+    return None
+
+
+def _get_bound_names(node: ast.AST) -> t.Iterator[str]:
+    """
+    names that a top level statement (other than a function definition) -
+    binds or modifies, including the ones in its nested blocks, but not in -
+    nested functions or classes.
+    """
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and not (
+        node.name.startswith('_')
+    ):
+        raise _NotStatic  # a public function defined conditionally.
+    if isinstance(node, (
+        ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef
+    )):
+        yield node.name
+        return
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        for alias in node.names:
+            if alias.name == '*':
+                raise _NotStatic  # it may rebind any name.
+            name = (alias.asname or alias.name).split('.')[0]
+            if isinstance(node, ast.ImportFrom) and not name.startswith('_'):
+                if _may_be_function(node, alias.name):
+                    raise _NotStatic
+            yield name
+        return
+    if isinstance(node, ast.Name) and isinstance(
+        node.ctx, (ast.Store, ast.Del)
+    ):
+        yield node.id
+        return
+    if isinstance(node, ast.Attribute) and isinstance(
+        node.ctx, (ast.Store, ast.Del)
+    ) and isinstance(node.value, ast.Name):
+        yield node.value.id  # e.g. `foo.__doc__ = ...` modifies `foo`.
+        return
+    for child in ast.iter_child_nodes(node):
+        yield from _get_bound_names(child)
+
+
+def _may_be_function(node: ast.ImportFrom, name: str) -> bool:
+    if node.module == '__future__':
+        return False
+    if node.level or (module := sys.modules.get(node.module)) is None:
+        return True  # relative, or not imported yet.
+    return type(getattr(module, name, None)) is FunctionType
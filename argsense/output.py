@@ -0,0 +1,386 @@
+"""
+structured output of command results, so that argsense tools can be chained -
+in pipelines without parsing printed text.
+
+the format is selected by a special arg (`:json`, `:ndjson` or `:msgpack`) -
+in command line, or by `config.OUTPUT_FORMAT` for all commands:
+    json: the return value as one json document. an iterator (e.g. a -
+        generator) is written as a json array, its elements are streamed, -
+        see `stream_output`.
+    ndjson: one json document per line. a list, tuple or iterator is -
+        written element by element, other values take one line, None -
+        writes nothing.
+    msgpack: the return value as one msgpack object. an iterator is -
+        written as a sequence of objects, one per element, which can be read -
+        by `msgpack.Unpacker`. the `msgpack` package is used if installed, -
+        otherwise a built-in encoder.
+
+values that json/msgpack do not support are converted by `_default`.
+
+in these formats stdout carries the output only, the prints of the command -
+go to stderr, see `redirect_prints`.
+"""
+import json
+import os
+import struct
+import sys
+import threading
+import typing as t
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextlib import redirect_stdout
+from dataclasses import asdict
+from dataclasses import is_dataclass
+from inspect import isasyncgen
+from time import perf_counter
+
+from . import config
+from . import console
+
+
+class T:
+    Format = t.Literal['json', 'msgpack', 'ndjson']
+
+
+def write_output(value: t.Any, format_: T.Format, file: t.IO = None) -> None:
+    """
+    params:
+        file: defaults to `sys.stdout`, or its binary buffer for msgpack.
+    """
+    if isinstance(value, Iterator) or isasyncgen(value):
+        stream_output(value, format_, file)
+        return
+    if format_ == 'msgpack':
+        sys.stdout.flush()
+        file = file or sys.stdout.buffer
+        data = _get_packer()(value)
+    elif format_ == 'ndjson':
+        file = file or sys.stdout
+        if isinstance(value, (list, tuple)):
+            data = ''.join(_dumps(x) + '\n' for x in value)
+        else:
+            data = '' if value is None else _dumps(value) + '\n'
+    else:
+        file = file or sys.stdout
+        data = _dumps(value) + '\n'
+    try:
+        file.write(data)
+        file.flush()
+    except BrokenPipeError:
+        _exit_on_broken_pipe(file)
+
+
+@contextmanager
+def redirect_prints(
+    format_: t.Union[T.Format, t.Literal['']]
+) -> t.Iterator[None]:
+    """
+    the context to run command code in, when its result is written here.
+    
+    in a structured format, the prints of command (to stdout or stderr) go -
+    to stderr. the output must be written outside the context, or to a file -
+    resolved before entering it.
+    lk_logger's print is replaced by the builtin one (see `./console.py : -
+    def plain_print`), it prints in a background thread and always to -
+    stdout, so its messages would interleave with the output at random, or -
+    be lost if stdout is closed by the reader (see `stream_output`).
+    """
+    with console.plain_print():
+        if format_:
+            with redirect_stdout(sys.stderr):
+                yield
+        else:
+            yield
+
+
+def stream_output(
+    value: t.Union[t.AsyncIterator, t.Iterator],
+    format_: t.Union[T.Format, t.Literal['']] = '',
+    file: t.IO = None,
+) -> int:
+    """
+    drive an iterator (e.g. the generator returned by a command) and write -
+    its elements as they are produced.
+    
+    the output is buffered, and written out when the buffer exceeds -
+    `config.STREAM_BUFFER_SIZE`, or at most `config.STREAM_FLUSH_INTERVAL` -
+    after an element is produced, even if the producer is blocked. the -
+    first element is written at once.
+    a write blocks until the reader takes it, so does the producer, the -
+    memory usage is bounded.
+    if the reader goes away (e.g. `... | head`), the producer is closed (its -
+    `finally` blocks run) and the program exits with code 141, as if it -
+    were killed by SIGPIPE, without a traceback.
+    
+    params:
+        format_: '' means plain text, an element per line, None is skipped.
+    returns:
+        the count of elements.
+    """
+    if isasyncgen(value):
+        from .aio import iterate_async_gen
+        iterator = iterate_async_gen(value)
+    else:
+        iterator = iter(value)
+    if format_ == 'msgpack':
+        sys.stdout.flush()  # the text written before.
+        file = file or sys.stdout.buffer
+        encode = _get_packer()
+    else:
+        file = file or sys.stdout
+        encode = {
+            ''      : lambda x: '' if x is None else '{}\n'.format(x),
+            'json'  : _dumps,
+            'ndjson': lambda x: _dumps(x) + '\n',
+        }[format_]
+    writer = _BufferedWriter(file, binary=format_ == 'msgpack')
+    progress = _Progress() if config.STREAM_SHOW_PROGRESS else None
+    
+    count = 0
+    # the command code runs in iterating.
+    with redirect_prints(format_):
+        try:
+            if format_ == 'json':
+                writer.write('[')
+            for x in iterator:
+                data = encode(x)
+                if format_ == 'json' and count:
+                    data = ', ' + data
+                count += 1
+                writer.write(data, urgent=count == 1)
+                if progress:
+                    progress.update(count)
+            if format_ == 'json':
+                writer.write(']\n')
+            writer.flush()
+        except BrokenPipeError:
+            _exit_on_broken_pipe(file)
+        except KeyboardInterrupt:
+            try:
+                writer.flush()
+            except BrokenPipeError:
+                pass
+            raise
+        finally:
+            writer.close()
+            if hasattr(iterator, 'close'):
+                iterator.close()  # a no-op if it is exhausted.
+            if progress:
+                progress.finish(count)
+    return count
+
+
+class _BufferedWriter:
+    """
+    the buffer is written out when it exceeds `config.STREAM_BUFFER_SIZE`, -
+    or by a background thread when it has been pending for -
+    `config.STREAM_FLUSH_INTERVAL`, so that an element does not wait for the -
+    next one while the producer is blocked.
+    """
+    
+    def __init__(self, file: t.IO, binary: bool) -> None:
+        self._chunks = []
+        self._empty = b'' if binary else ''
+        self._error: t.Optional[BaseException] = None
+        self._file = file
+        self._lock = threading.Lock()
+        self._size = 0
+        self._stopped = threading.Event()
+        self._timer: t.Optional[threading.Thread] = None
+    
+    def write(self, data: t.AnyStr, urgent: bool = False) -> None:
+        with self._lock:
+            if self._error:
+                raise self._error
+            self._chunks.append(data)
+            self._size += len(data)
+            if (
+                urgent or
+                self._size >= config.STREAM_BUFFER_SIZE or
+                config.STREAM_FLUSH_INTERVAL <= 0
+            ):
+                self._flush()
+            elif self._timer is None:
+                self._timer = threading.Thread(target=self._run, daemon=True)
+                self._timer.start()
+    
+    def flush(self) -> None:
+        with self._lock:
+            if self._error:
+                raise self._error
+            self._flush()
+    
+    def close(self) -> None:
+        """ stop the background thread, the buffer is not written. """
+        self._stopped.set()
+        if self._timer:
+            self._timer.join()
+    
+    def _flush(self) -> None:
+        if self._chunks:
+            self._file.write(self._empty.join(self._chunks))
+            self._chunks.clear()
+            self._size = 0
+        self._file.flush()
+    
+    def _run(self) -> None:
+        while not self._stopped.wait(config.STREAM_FLUSH_INTERVAL):
+            with self._lock:
+                if self._chunks and not self._error:
+                    try:
+                        self._flush()
+                    except BaseException as e:  # e.g. BrokenPipeError.
+                        self._error = e  # raised in the next write.
+
+
+class _Progress:
+    """ the count and throughput of streamed elements, shown in stderr. """
+    
+    def __init__(self) -> None:
+        self._start = self._last = perf_counter()
+    
+    def update(self, count: int) -> None:
+        if (now := perf_counter()) - self._last >= 0.5:
+            self._last = now
+            self._show(count, now)
+    
+    def finish(self, count: int) -> None:
+        self._show(count, perf_counter())
+        sys.stderr.write('\n')
+        sys.stderr.flush()
+    
+    def _show(self, count: int, now: float) -> None:
+        elapsed = now - self._start
+        sys.stderr.write(
+            '\r[argsense] {} items in {:.1f}s, {:.0f} items/s'.format(
+                count, elapsed, count / elapsed if elapsed else 0
+            )
+        )
+        sys.stderr.flush()
+
+
+def _exit_on_broken_pipe(file: t.IO) -> t.NoReturn:
+    # python flushes stdout again at exit, point it (the output file, -
+    # `sys.stdout` may be redirected now) to devnull so that the broken pipe -
+    # is not reported again.
+    try:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), file.fileno())
+    except (AttributeError, OSError, ValueError):
+        pass
+    sys.exit(141)  # 128 + SIGPIPE
+
+
+def _dumps(value: t.Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=_default)
+
+
+def _default(value: t.Any) -> t.Any:
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, (frozenset, set)):
+        return list(value)
+    if isinstance(value, (bytearray, bytes, memoryview)):
+        return bytes(value).decode('utf-8', 'backslashreplace')
+    if isinstance(value, Iterator):
+        return list(value)
+    return str(value)  # e.g. `pathlib.Path`, `datetime`.
+
+
+# -----------------------------------------------------------------------------
+# msgpack
+
+def _get_packer() -> t.Callable[[t.Any], bytes]:
+    try:
+        import msgpack
+    except ImportError:
+        return pack
+    return msgpack.Packer(default=_default).pack
+
+
+def pack(value: t.Any) -> bytes:
+    """
+    a minimal msgpack encoder (nil, bool, int, float, str, bin, array and -
+    map), used when the `msgpack` package is not installed.
+    """
+    out = bytearray()
+    _pack(value, out)
+    return bytes(out)
+
+
+def _pack(value: t.Any, out: bytearray) -> None:
+    if value is None:
+        out.append(0xc0)
+    elif value is False:
+        out.append(0xc2)
+    elif value is True:
+        out.append(0xc3)
+    elif isinstance(value, int):
+        if 0 <= value < 0x80:
+            out.append(value)
+        elif -0x20 <= value < 0:
+            out += struct.pack('b', value)
+        elif value >= 0:
+            for fmt, code in (('B', 0xcc), ('H', 0xcd), ('I', 0xce)):
+                if value < 1 << (struct.calcsize(fmt) * 8):
+                    out.append(code)
+                    out += struct.pack('>' + fmt, value)
+                    break
+            else:
+                out.append(0xcf)
+                out += struct.pack('>Q', value)
+        else:
+            for fmt, code in (('b', 0xd0), ('h', 0xd1), ('i', 0xd2)):
+                if value >= -(1 << (struct.calcsize(fmt) * 8 - 1)):
+                    out.append(code)
+                    out += struct.pack('>' + fmt, value)
+                    break
+            else:
+                out.append(0xd3)
+                out += struct.pack('>q', value)
+    elif isinstance(value, float):
+        out.append(0xcb)
+        out += struct.pack('>d', value)
+    elif isinstance(value, str):
+        data = value.encode('utf-8')
+        _pack_header(len(data), out, 0xa0, 32, (0xd9, 0xda, 0xdb))
+        out += data
+    elif isinstance(value, (bytearray, bytes, memoryview)):
+        data = bytes(value)
+        _pack_header(len(data), out, None, 0, (0xc4, 0xc5, 0xc6))
+        out += data
+    elif isinstance(value, dict):
+        _pack_header(len(value), out, 0x80, 16, (None, 0xde, 0xdf))
+        for k, v in value.items():
+            _pack(k, out)
+            _pack(v, out)
+    elif isinstance(value, (list, tuple)):
+        _pack_header(len(value), out, 0x90, 16, (None, 0xdc, 0xdd))
+        for x in value:
+            _pack(x, out)
+    else:
+        _pack(_default(value), out)
+
+
+def _pack_header(
+    size: int,
+    out: bytearray,
+    fix_code: t.Optional[int],
+    fix_limit: int,
+    codes: t.Tuple[t.Optional[int], int, int],
+) -> None:
+    """
+    params:
+        codes: the type codes for 8, 16 and 32 bits length. the 8 bits one -
+            is None if the type does not have it (array and map).
+    """
+    if size < fix_limit:
+        out.append(fix_code | size)
+    elif size < 0x100 and codes[0] is not None:
+        out.append(codes[0])
+        out.append(size)
+    elif size < 0x10000:
+        out.append(codes[1])
+        out += struct.pack('>H', size)
+    else:
+        out.append(codes[2])
+        out += struct.pack('>I', size)
@@ -8,4 +8,5 @@ from .args_parser import parse_argstring
 from .args_parser import parse_argv
 from .docs_parser import parse_docstring
 from .func_parser import FuncInfo
+from .func_parser import ParamInfo
 from .func_parser import parse_function
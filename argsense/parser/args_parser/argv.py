@@ -1,13 +1,20 @@
+import mmap
 import os
+import re
+import shlex
 import sys
 import typing as t
 from textwrap import dedent
 
-import rich
-import rich.panel
+from . import exceptions as e
+from ... import config
 
 _DEBUG = os.getenv('ARGSENSE_DEBUG') == '1'
+_HELP_OPTIONS = (':h', ':help', '-h', '--help')
+_SHELL_CHARS = re.compile(r'["#\'\\]')  # see `_tokenize_file`.
 if _DEBUG:
+    from ...console import setup
+    setup()
     print(sys.orig_argv, sys.argv, ':lv')
 
 
@@ -18,15 +25,43 @@ class T:
 
 
 class Argv:
+    """
+    an arg like `@args.txt` is a response file, it is expanded to the args -
+    written in that file (see `_tokenize_file`), in case the command line is -
+    too long for the os limit. it is off by default, see -
+    `config.EXPAND_RESPONSE_FILES`.
+    `args` is the expanded one, `raw_args` keeps the original, use `locate` -
+    to map an index between them.
+    """
     launcher: T.ArgvLauncher
     target: T.ArgvTarget
     args: T.ArgvArgs
+    raw_args: T.ArgvArgs
     
     @property
-    def possible_function(self) -> t.Optional[str]:  # FIXME: not reliable
-        for x in self.args:
-            if not x.startswith(('_', '-')):
-                return x.replace('_', '-')
+    def command_index(self) -> t.Optional[int]:
+        """
+        the position (counted like `__iter__`) of the command name in group -
+        mode, or None if there is no command given.
+        it follows the same rule as the parser: only a help option is -
+        allowed ahead of command, so the command is the first arg, or the -
+        second one if the first is a help option. options (and their values) -
+        are always behind the command, they never need to be skipped.
+        """
+        i = 1 if self.args and self.args[0] in _HELP_OPTIONS else 0
+        if len(self.args) > i and not self.args[i].startswith((':', '-')):
+            return self.argx + i
+        return None
+    
+    @property
+    def possible_function(self) -> t.Optional[str]:
+        """
+        the command name (with '_' replaced by '-') in group mode, see -
+        `command_index`.
+        """
+        if (i := self.command_index) is not None:
+            return self.args[i - self.argx].replace('_', '-')
+        return None
     
     @classmethod
     def from_sys_argv(cls) -> 'Argv':
@@ -52,6 +87,15 @@ class Argv:
         argv = tuple(sys.argv)
         if _DEBUG:
             print(argv, ':plv')
+        try:
+            return cls._from_sys_argv(argv)
+        except e.ResponseFileError as err:
+            if _DEBUG:
+                raise err
+            report(err.index, str(err))
+    
+    @staticmethod
+    def _from_sys_argv(argv: t.Tuple[str, ...]) -> 'Argv':
         if argv[0] == '-m':
             return Argv((sys.executable, '-m'), (argv[1],), argv[2:])
         elif argv[0].endswith(('\\__main__.py', '/__main__.py')):
@@ -71,8 +115,17 @@ class Argv:
     ) -> None:
         self.launcher = launcher
         self.target = target
-        self.args = args
+        self.raw_args = args
         self.argx = len(launcher) + len(target)
+        self._spans: t.List[t.Tuple[int, int, int, str]] = []
+        #   [(start, stop, raw_index, path), ...]. `args[start:stop]` are -
+        #   expanded from `raw_args[raw_index]`, which is '@' + path.
+        if config.EXPAND_RESPONSE_FILES and any(
+            x.startswith('@') for x in args
+        ):
+            self.args = self._expand_response_files(args)
+        else:
+            self.args = args
     
     def __iter__(self) -> t.Iterator[t.Tuple[int, str, int]]:
         """
@@ -86,9 +139,110 @@ class Argv:
         for x in self.args:
             i += 1
             yield i, x, 1
+    
+    def locate(
+        self, index: int
+    ) -> t.Tuple[int, t.Optional[t.Tuple[str, int, str]]]:
+        """
+        map an index (counted like `__iter__`) of `args` to the index of -
+        `raw_args`.
+        
+        returns: (raw_index, source)
+            source: (path, lineno, arg) if the arg comes from a response -
+                file, otherwise None.
+        """
+        i = index - self.argx
+        if i < 0 or not self._spans:
+            return index, None
+        raw_i = i
+        for start, stop, raw_index, path in self._spans:
+            if i < start:
+                break
+            if i < stop:
+                # the line number is not kept for every arg, find it by -
+                # tokenizing the file again, this only happens on error.
+                k = i - start
+                for lineno, args in _tokenize_file(path):
+                    if k < len(args):
+                        return self.argx + raw_index, (path, lineno, args[k])
+                    k -= len(args)
+                return self.argx + raw_index, None
+            raw_i = raw_index + 1 + (i - stop)
+        return self.argx + raw_i, None
+    
+    def _expand_response_files(self, args: T.ArgvArgs) -> T.ArgvArgs:
+        """
+        an arg starts with '@' is expanded only if it refers to an existing -
+        file, otherwise it is kept as is.
+        """
+        out = []
+        for i, x in enumerate(args):
+            if x.startswith('@') and os.path.isfile(x[1:]):
+                start = len(out)
+                try:
+                    for _, line_args in _tokenize_file(x[1:]):
+                        out.extend(line_args)
+                except (OSError, ValueError) as err:
+                    raise e.ResponseFileError(
+                        self.argx + i,
+                        x[1:],
+                        getattr(err, 'lineno', None),
+                        str(err),
+                    )
+                self._spans.append((start, len(out), i, x[1:]))
+            else:
+                out.append(x)
+        return tuple(out)
+
+
+class _TokenizeError(ValueError):
+    def __init__(self, lineno: int, reason: str) -> None:
+        super().__init__(reason)
+        self.lineno = lineno
+
+
+def _tokenize_file(path: str) -> t.Iterator[t.Tuple[int, t.List[str]]]:
+    """
+    split a response file into args line by line, the file is memory-mapped -
+    rather than loaded as a whole.
+    the syntax is the same as `shlex.split` (posix mode, '#' starts a -
+    comment), a quoted arg can span lines. an '@file' arg inside a response -
+    file is not expanded again.
+    
+    yields: (lineno, args)
+        for a quoted arg spans lines, lineno is where the arg starts.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # an empty file can not be mapped.
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            pending, start = '', 0
+            for lineno, raw in enumerate(iter(m.readline, b''), 1):
+                try:
+                    line = raw.decode('utf-8-sig' if lineno == 1 else 'utf-8')
+                except UnicodeDecodeError as err:
+                    raise _TokenizeError(lineno, str(err))
+                if pending:
+                    line = pending + line
+                elif not _SHELL_CHARS.search(line):
+                    yield lineno, line.split()  # the fast path.
+                    continue
+                else:
+                    start = lineno
+                try:
+                    args = shlex.split(line, comments=True)
+                except ValueError:  # a quoted arg continues on next line.
+                    pending = line
+                    continue
+                pending = ''
+                yield start, args
+            if pending:
+                raise _TokenizeError(start, 'No closing quotation')
 
 
-def report(err_idx: int, err_msg: str, err_type: str = None) -> None:
+def report(
+    err_idx: int, err_msg: str, err_type: str = None, argv: Argv = None
+) -> None:
     """
     accurately report which element is parsing failed.
     
@@ -99,10 +253,27 @@ def report(err_idx: int, err_msg: str, err_type: str = None) -> None:
             `--bar` was not recognized as a valid option in `foo` command. did
             you mean "--bart"?
     
+    params:
+        argv: if given and it has response files expanded, the original args -
+            are shown, and the file and line of the failing arg are told.
+    
     see also:
         ./exceptions.py
     """
+    import rich
+    import rich.panel
+    from rich.markup import escape
+    from ...console import setup
+    setup()
+    
     xlist = ['python'] + sys.argv
+    if argv is not None and argv._spans:  # noqa
+        xlist = ['python', *argv.launcher[1:], *argv.target, *argv.raw_args]
+        err_idx, source = argv.locate(err_idx)
+        if source:
+            err_msg += '\n\nThe argument "{}" comes from {}, line {}.'.format(
+                escape(source[2]), escape(source[0]), source[1]
+            )
     if 0 <= err_idx < len(xlist):
         xlist[err_idx] = '[red u]{}[/]'.format(xlist[err_idx])
     else:
@@ -8,8 +8,55 @@ class ArgvParsingFailed(Exception):
         self.index = index
 
 
+class CommandNotFound(ArgvParsingFailed):
+    def __init__(
+        self, index: int, command: str, candidates: t.Iterable[str]
+    ) -> None:
+        self.index = index
+        self.command = command
+        self.candidates = candidates
+    
+    def __str__(self) -> str:
+        if x := did_you_mean(self.command, self.candidates):
+            return _dedent(
+                '''
+                Command "{}" not found, did you mean "{}"?
+                '''
+            ).format(self.command, x)
+        else:
+            return _dedent(
+                '''
+                Command "{}" not found.
+                Please check `--help` for available commands.
+                '''
+            ).format(self.command)
+
+
 class FunctionIsRequired(ArgvParsingFailed):
-    pass
+    def __str__(self) -> str:
+        return 'A command is required!'
+
+
+class ResponseFileError(ArgvParsingFailed):
+    def __init__(
+        self, index: int, path: str, lineno: t.Optional[int], reason: str
+    ) -> None:
+        self.index = index
+        self.path = path
+        self.lineno = lineno
+        self.reason = reason
+    
+    def __str__(self) -> str:
+        return _dedent(
+            '''
+            Failed reading response file "{}"{}:
+            {}
+            '''
+        ).format(
+            self.path,
+            '' if self.lineno is None else ', line {}'.format(self.lineno),
+            self.reason,
+        )
 
 
 class InsufficientArguments(ArgvParsingFailed):
@@ -144,8 +191,8 @@ def did_you_mean(
         - user types a wrong command name
         - user types a wrong option name
     see also:
-        - [./cli.py : def run() : KeyError occurance]
-        - [./argparse/parser.py : def parse_sys_argv()]
+        - [./exceptions.py : class CommandNotFound]
+        - [./exceptions.py : class ParamNotFound]
 
     note: we are using the built-in library - [#1 difflib] - to implement this.
 
@@ -13,6 +13,7 @@ class ParamType(Enum):
     LIST = auto()
     NONE = auto()
     NUMBER = auto()
+    STREAM = auto()
     TEXT = auto()
     # UNKNOWN = auto()
 
@@ -24,12 +25,24 @@ class T:
 
 
 class ParamsHolder:
+    """
+    unresolved params are stored in dicts (ordered, O(1) lookup and removal -
+    by name). positional resolving takes the first unresolved one in -
+    declaration order, which is found by a cursor that only moves forward -
+    over `_args_order` and `_kwargs_order`.
+    """
     
     def __init__(self, args: T.Args, kwargs: T.KwArgs, **references) -> None:
         self._cnames = references.get('cnames', ('[i]...[/]',))
         
-        self._args = [(k, v) for k, v in args.items() if k != '*']
-        self._kwargs = [(k, v) for k, v in kwargs.items() if k != '**']
+        self._args = {k: v for k, v in args.items() if k != '*'}
+        self._kwargs = {k: v for k, v in kwargs.items() if k != '**'}
+        self._args_order = tuple(self._args)
+        self._kwargs_order = tuple(
+            k for k in self._kwargs if not k.startswith(':')
+        )
+        self._args_cursor = 0
+        self._kwargs_cursor = 0
         
         self._has_args = '*' in args
         self._has_kwargs = '**' in kwargs
@@ -43,32 +56,32 @@ class ParamsHolder:
     def get_and_pop_param(self, index: int, name: str = None) -> T.Param:
         if name:
             # let's check kwargs first.
-            for i, (k, _) in enumerate(self._kwargs):
-                if k == name:
-                    return self._kwargs.pop(i)
-            for i, (k, _) in enumerate(self._args):
-                if k == name:
-                    return self._args.pop(i)
+            if name in self._kwargs:
+                return name, self._kwargs.pop(name)
+            if name in self._args:
+                return name, self._args.pop(name)
             if self._has_kwargs:
                 return name, ParamType.ANY
             raise e.ParamNotFound(index, name, self._cnames)
         else:
             # check args first.
             if self._args:
-                return self._args.pop(0)
+                while (k := self._args_order[self._args_cursor]) not in (
+                    self._args
+                ):
+                    self._args_cursor += 1
+                return k, self._args.pop(k)
             if self._has_args:
                 return self._generate_anonymous_arg_name(), ParamType.ANY
-            if self._kwargs:
-                for i, (k, _) in enumerate(self._kwargs):
-                    if not k.startswith(':'):
-                        return self._kwargs.pop(i)
+            while self._kwargs_cursor < len(self._kwargs_order):
+                k = self._kwargs_order[self._kwargs_cursor]
+                self._kwargs_cursor += 1
+                if k in self._kwargs:
+                    return k, self._kwargs.pop(k)
             raise e.TooManyArguments(index)
     
     def resolve(self, kwname: str) -> None:  # note: no usage yet.
-        for i, (k, v) in enumerate(self._kwargs):
-            if k == kwname:
-                self._kwargs.pop(i)
-                break
+        self._kwargs.pop(kwname, None)
     
     _simple_counter = 0
     
@@ -19,6 +19,10 @@ class T:  # Typehint
         'args'  : t.Dict[_ParamName, ParamType],
         'kwargs': t.Dict[_KwArgName, ParamType],
         'index' : t.Dict[_OptionName, _KwArgName],
+        'containers': t.Dict[_ParamName, tuple],
+        #   see `func_parser.T.ContainerSpec`. optional.
+        'streams': t.Dict[_ParamName, str],
+        #   see `func_parser.FuncInfo.streams`. optional.
     })
     
     ParsedResult = t.TypedDict('ParsedResult', {
@@ -36,14 +40,20 @@ def parse_argv(
     argv: Argv,
     mode: t.Literal['command', 'group'],
     front_matter: T.ParamsInfo,
+    raise_error: bool = False,
 ) -> t.Optional[T.ParsedResult]:
+    """
+    params:
+        raise_error: if true, raise `ArgvParsingFailed` instead of reporting -
+            it and exiting the program.
+    """
     try:
         return _walking_through_argv(argv, mode, front_matter)
     except e.ArgvParsingFailed as err:
-        if os.getenv('ARGSENSE_DEBUG') == '1':
+        if raise_error or os.getenv('ARGSENSE_DEBUG') == '1':
             raise err
         else:
-            report(err.index, str(err))
+            report(err.index, str(err), argv=argv)
 
 
 def _walking_through_argv(
@@ -51,7 +61,7 @@ def _walking_through_argv(
     mode: t.Literal['command', 'group'],
     front_matter: T.ParamsInfo
 ) -> T.ParsedResult:
-    from ...converter import SPECIAL_ARGS, cval_2_val
+    from ...converter import SPECIAL_ARGS, cval_2_val, merge_containers
     
     flag = 'INIT'
     out = {
@@ -62,15 +72,17 @@ def _walking_through_argv(
     params = ParamsHolder(
         front_matter['args'],
         front_matter['kwargs'],
-        cnames=tuple(front_matter['index'].keys())
+        cnames=front_matter['index'].keys()
     )
+    containers = front_matter.get('containers', {})
+    streams = front_matter.get('streams', {})
     temp_store = {}
     
     # -------------------------------------------------------------------------
     
     def feed_anonymous_arg() -> None:
         implicit_name, param_type = params.get_and_pop_param(index)
-        param_value = _eval_param_value(arg, param_type)
+        param_value = _eval_param_value(arg, param_type, implicit_name)
         out['args'][implicit_name] = param_value
     
     def feed_help() -> None:
@@ -104,7 +116,7 @@ def _walking_through_argv(
         else:
             option_name = arg
             param_name = _get_option_name(option_name)
-            param_type = params.get_and_pop_param(index, param_name)[1]
+            param_type = _pop_option_param(param_name)
             if param_type == ParamType.FLAG:
                 out['kwargs'][param_name] = True
                 return True
@@ -116,7 +128,12 @@ def _walking_through_argv(
     def feed_option_value() -> None:
         param_name = temp_store['param_name']
         param_type = temp_store['param_type']
-        param_value = _eval_param_value(arg, param_type)
+        param_value = _eval_param_value(arg, param_type, param_name)
+        if param_name in containers and param_name in out['kwargs']:
+            # a repeated option, see `_pop_option_param`.
+            param_value = merge_containers(
+                out['kwargs'][param_name], param_value
+            )
         out['kwargs'][param_name] = param_value
         temp_store.clear()
     
@@ -150,7 +167,7 @@ def _walking_through_argv(
         else:
             option_name = arg
             param_name = _get_option_name(option_name)
-            param_type = params.get_and_pop_param(index, param_name)[1]
+            param_type = _pop_option_param(param_name)
             if param_type == ParamType.FLAG:
                 out['kwargs'][param_name] = True
                 return True
@@ -164,9 +181,19 @@ def _walking_through_argv(
         if arg in (':h', ':help'):
             assert ':help' not in out['kwargs']
             out['kwargs'][':help'] = True
-        elif arg == ':loop':
+        elif arg in (':batch', ':parallel'):
+            # in group mode, it can be given in place of the command, which -
+            # is given by the input lines then, e.g. `prog :batch < lines`.
+            if mode == 'command' or out['command'] or index == argv.argx:
+                # the value is its position, batch mode puts the other args -
+                # in front of each line. see `cli.CommandLineInterface -
+                # .exec_argv`.
+                out['kwargs'][arg] = index
+            else:
+                raise e.FunctionIsRequired(index)
+        elif arg in (':json', ':loop', ':msgpack', ':ndjson'):
             if mode == 'command' or out['command']:
-                out['kwargs'][':loop'] = True
+                out['kwargs'][arg] = True
             else:
                 raise e.FunctionIsRequired(index)
         else:
@@ -176,9 +203,16 @@ def _walking_through_argv(
     
     # -------------------------------------------------------------------------
     
-    def _eval_param_value(x: str, possible_type: ParamType) -> t.Any:
+    def _eval_param_value(
+        x: str, possible_type: ParamType, param_name: str = None
+    ) -> t.Any:
         try:
-            return cval_2_val(x, possible_type)
+            return cval_2_val(
+                x,
+                possible_type,
+                streams.get(param_name) if possible_type == ParamType.STREAM
+                else containers.get(param_name),
+            )
         except AssertionError:
             raise e.TypeConversionError(
                 index,
@@ -186,6 +220,17 @@ def _walking_through_argv(
                 given_type=str(arg)
             )
     
+    def _pop_option_param(param_name: str) -> ParamType:
+        """
+        a list/dict param can be given repeatedly, its values are merged, -
+        e.g. `--ids 1,2 --ids 3` -> `ids=[1, 2, 3]`.
+        """
+        if param_name in containers and param_name in out['kwargs']:
+            return front_matter['kwargs'].get(
+                param_name, front_matter['args'].get(param_name)
+            )
+        return params.get_and_pop_param(index, param_name)[1]
+    
     def _get_option_name(cname: str) -> str:
         """ convert cname to name. """
         if cname in front_matter['index']:
@@ -201,7 +246,10 @@ def _walking_through_argv(
         # print(':v', index, arg)
         if flag == 'INIT':
             if mode == 'group':
-                if arg.startswith((':', '-')):
+                if arg in (':batch', ':parallel'):
+                    feed_special_arg()
+                    flag = 'IDLE'
+                elif arg.startswith((':', '-')):
                     feed_help()
                     flag = 'FUNC_NAME'
                 else:
@@ -214,7 +262,7 @@ def _walking_through_argv(
                 elif arg.startswith('--'):
                     resolved = feed_option_name()
                     flag = 'IDLE' if resolved else 'OPTION_VALUE'
-                elif arg.startswith('-'):
+                elif arg.startswith('-') and arg != '-':  # '-' is stdin.
                     resolved = feed_short_option_name()
                     flag = 'IDLE' if resolved else 'OPTION_VALUE'
                 else:
@@ -229,7 +277,7 @@ def _walking_through_argv(
             elif arg.startswith('--'):
                 resolved = feed_option_name()
                 flag = 'IDLE' if resolved else 'OPTION_VALUE'
-            elif arg.startswith('-'):
+            elif arg.startswith('-') and arg != '-':
                 resolved = feed_short_option_name()
                 flag = 'IDLE' if resolved else 'OPTION_VALUE'
             else:
@@ -289,7 +337,8 @@ def _walking_through_argv(
     
     # post check
     if bool(params):
-        if ':help' not in out['kwargs']:
+        # in batch mode, the rest args are given by the input lines.
+        if not {':batch', ':help', ':parallel'} & out['kwargs'].keys():
             raise e.InsufficientArguments(
                 -1, tuple(front_matter['args'].keys())[len(out['args']):]
             )
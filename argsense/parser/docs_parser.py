@@ -43,6 +43,71 @@ class T:
     })
 
 
+# -----------------------------------------------------------------------------
+# line kinds, every line is classified once by `_tokenize`.
+
+_BLANK = 0
+_TEXT = 1  # unindented text.
+_FIELD = 2  # unindented text ends with ':', e.g. 'examples:'.
+_PARAMS_FIELD = 3  # e.g. 'params:', see `_params_fields`.
+_STANDALONE_FIELD = 4  # 'argsense:' or 'help:'.
+_PARAM = 5  # e.g. '    aaa (-a): blabla'.
+_VAR_ARGS = 6  # e.g. '    *args: blabla'.
+_VAR_KWARGS = 7  # e.g. '    **kwargs:'.
+_EXTRA_PARAM = 8  # e.g. '        bbb (-b): blabla', under `**kwargs`.
+_INDENTED = 9  # other indented text.
+
+_params_fields = frozenset((
+    'params:',  # recommended
+    'args:', 'kwargs:', 'opts:', 'options:',
+))
+_standalone_fields = frozenset(('argsense:', 'help:'))
+
+_line_continuation = re.compile(r' - *\n +')
+_param_line = re.compile(
+    r' {4}(?:'
+    r'(?P<param>\w+)(?: \((?P<short>-\w)\))?'
+    r'|\*\w+'
+    r'|\*\*\w+'
+    r'| {4}(?P<extra>\w+)(?: \((?P<extra_short>-\w)\))?'
+    r'):(?: (?P<text>.*))?'
+)
+#   note the short name is limited to `-\w` here, a line like -
+#   '    aaa (-a1): ...' is not a param field.
+
+
+def _tokenize(
+    doc: str
+) -> t.Iterator[t.Tuple[int, str, t.Optional[t.Match]]]:
+    """
+    yields: ((kind, line, match), ...)
+        match is a `_param_line` match for param kinds, else None.
+    """
+    for line in doc.splitlines():
+        if not line:
+            yield _BLANK, line, None
+        elif line[0] != ' ':
+            if line[-1] != ':':
+                yield _TEXT, line, None
+            elif (x := line.lower()) in _params_fields:
+                yield _PARAMS_FIELD, line, None
+            elif x in _standalone_fields:
+                yield _STANDALONE_FIELD, line, None
+            else:
+                yield _FIELD, line, None
+        elif m := _param_line.match(line):
+            if (x := line[4]) == ' ':
+                yield _EXTRA_PARAM, line, m
+            elif x != '*':
+                yield _PARAM, line, m
+            elif line[5] == '*':
+                yield _VAR_KWARGS, line, m
+            else:
+                yield _VAR_ARGS, line, m
+        else:
+            yield _INDENTED, line, None
+
+
 def parse_docstring(doc: str, funsig: 'FuncInfo') -> T.DocsInfo:
     """
     doc: /docs/how-to-parse-docstring.md
@@ -67,7 +132,7 @@ def parse_docstring(doc: str, funsig: 'FuncInfo') -> T.DocsInfo:
         return out
     
     doc = dedent(doc).strip()
-    doc = re.sub(r' - *\n +', ' ', doc)
+    doc = _line_continuation.sub(' ', doc)
     
     flag = 'INIT'
     temp_str: str = ''
@@ -79,38 +144,31 @@ def parse_docstring(doc: str, funsig: 'FuncInfo') -> T.DocsInfo:
             temp_str += line[:-2]
         else:
             temp_str += line + '\n'
-            
-    def add_extra_param(line: str) -> None:
-        add_param(line[4:])
     
-    def add_param(line: str) -> None:
-        nonlocal temp_str, temp_dict
-        
-        # print(line, ':v')
-        m = re.match(r' {4}(\*?)(\w+)(?: \((-\w\d*)\))?:(?: (.*))?', line)
-        #                  ~~~~1~~~~2      ~~~~~~~3         ~~~4
-        has_asterisk = bool(m.group(1))
-        param_name = m.group(2)
-        param_short = m.group(3) or ''
-        leading_text = m.group(4) or ''
+    def add_param(kind: int, m: t.Match) -> None:
+        nonlocal temp_dict
         
-        if has_asterisk:
-            assert param_short == ''
+        if kind == _VAR_ARGS:
             temp_dict = out['args']['*'] = {
-                'cname' : funsig.args['*']['cname'],
+                'cname' : funsig.args['*'].cname,
                 'cshort': '',
                 'desc'  : '',
             }
         else:
+            if kind == _PARAM:
+                param_name, param_short = m['param'], m['short'] or ''
+            else:
+                assert kind == _EXTRA_PARAM, kind
+                param_name, param_short = m['extra'], m['extra_short'] or ''
             if param_name in funsig.args:
                 temp_dict = out['args'][param_name] = {
-                    'cname' : funsig.args[param_name]['cname'],
+                    'cname' : funsig.args[param_name].cname,
                     'cshort': param_short,
                     'desc'  : '',
                 }
             elif param_name in funsig.kwargs:
                 temp_dict = out['kwargs'][param_name] = {
-                    'cname' : funsig.kwargs[param_name]['cname'],
+                    'cname' : funsig.kwargs[param_name].cname,
                     'cshort': param_short,
                     'desc'  : '',
                 }
@@ -130,7 +188,7 @@ def parse_docstring(doc: str, funsig: 'FuncInfo') -> T.DocsInfo:
                     )
         
         assert temp_str == ''
-        accumulate_lines(leading_text)
+        accumulate_lines(m['text'] or '')
     
     def finalize_desc() -> None:
         nonlocal temp_str
@@ -144,156 +202,106 @@ def parse_docstring(doc: str, funsig: 'FuncInfo') -> T.DocsInfo:
         temp_dict = None
         temp_str = ''
     
-    def is_extra_param_field(line: str) -> bool:
-        """
-        example:
-              | def foo(...):
-              |     '''
-              |     params:
-              |         aaa: the description text.
-              |         bbb (-b): the description text.
-              |         **kwargs:
-            * |             ccc: the description text.
-            * |             ddd (-d): the description text.
-              |     '''
-        """
-        return bool(re.match(r' {8}\w+(?: \(-\w\))?:', line))
-    
-    def is_new_field(line: str) -> bool:
-        if line.startswith(' '):
-            return False
-        if line.endswith(':'):
-            return True
-        return False
-    
-    def is_param_field(line: str) -> int:
-        """
-        diagram:
-              | def foo(...):
-              |     '''
-              |     params:
-            * |         aaa: the description text.
-            * |         *args: the description text.
-            * |         **kwargs:
-              |             aaa: the description text.
-              |     '''
-        """
-        if bool(re.match(r' {4}\w+(?: \(-\w\))?:', line)):
-            return 1
-        elif bool(re.match(r' {4}\*\w+:.*', line)):
-            return 2
-        elif bool(re.match(r' {4}\*\*\w+: *', line)):
-            return 3
-        else:
-            return 0
-    
-    def is_params_field(line: str) -> bool:
-        return line.lower() in (
-            'params:',  # recommended
-            'args:', 'kwargs:', 'opts:', 'options:',
-        )
-    
-    for i, line in enumerate(doc.splitlines()):
+    for i, (kind, line, m) in enumerate(_tokenize(doc)):
         if flag == 'INIT':
-            if line:
-                if is_new_field(line):
-                    if line.lower() in ('argsense:', 'help:'):
-                        flag = 'STANDALONE_DESC'
-                    elif is_params_field(line):
-                        flag = 'PARAMS'
-                    else:
-                        assert not temp_str
-                        flag = 'DESC_DONE'
-                else:
-                    assert not temp_str
-                    accumulate_lines(line)
-                    flag = 'TOP_DESC'
+            if kind == _BLANK:
+                assert not temp_str
+            elif kind == _STANDALONE_FIELD:
+                flag = 'STANDALONE_DESC'
+            elif kind == _PARAMS_FIELD:
+                flag = 'PARAMS'
+            elif kind == _FIELD:
+                assert not temp_str
+                flag = 'DESC_DONE'
             else:
                 assert not temp_str
+                accumulate_lines(line)
+                flag = 'TOP_DESC'
         
         elif flag == 'DESC_DONE':
-            if is_params_field(line):
+            if kind == _PARAMS_FIELD:
                 flag = 'PARAMS'
         
         elif flag == 'EXTRA_PARAM_DESC':
-            if not line.startswith(' '):
+            if kind <= _STANDALONE_FIELD:  # not indented.
                 finalize_param_desc()
                 flag = 'OVER'
                 break
-            elif is_param_field(line):
+            elif kind == _PARAM or kind == _VAR_ARGS:
                 finalize_param_desc()
-                add_param(line)
+                add_param(kind, m)
                 flag = 'PARAM_DESC'
-            elif is_extra_param_field(line):
+            elif kind == _VAR_KWARGS:
+                finalize_param_desc()
+                flag = 'EXTRA_PARAMS'
+            elif kind == _EXTRA_PARAM:
                 finalize_param_desc()
-                add_extra_param(line)
+                add_param(kind, m)
             else:
-                assert line == '' or line.startswith(' ' * 12)
+                assert line.startswith(' ' * 12)
                 accumulate_lines(line[12:])
-            
+        
         elif flag == 'EXTRA_PARAMS':
-            if line:
-                if not line.startswith(' '):
+            if kind != _BLANK:
+                if kind <= _STANDALONE_FIELD:
                     finalize_param_desc()
                     flag = 'OVER'
                     break
-                elif is_param_field(line):
+                elif kind == _PARAM or kind == _VAR_ARGS:
                     finalize_param_desc()
-                    add_param(line)
+                    add_param(kind, m)
                     flag = 'PARAM_DESC'
                 else:
-                    assert line.startswith(' ' * 8)
-                    assert is_extra_param_field(line)
-                    add_extra_param(line)
+                    assert kind == _EXTRA_PARAM
+                    add_param(kind, m)
                     flag = 'EXTRA_PARAM_DESC'
         
         elif flag == 'PARAM_DESC':
-            if not line.startswith(' '):
+            if kind <= _STANDALONE_FIELD:
                 finalize_param_desc()
                 flag = 'OVER'
                 break
-            elif x := is_param_field(line):
+            elif kind == _PARAM or kind == _VAR_ARGS:
                 finalize_param_desc()
-                if x == 1 or x == 2:
-                    add_param(line)
-                else:
-                    flag = 'EXTRA_PARAMS'
+                add_param(kind, m)
+            elif kind == _VAR_KWARGS:
+                finalize_param_desc()
+                flag = 'EXTRA_PARAMS'
             else:
-                assert line == '' or line.startswith(' ' * 8)
+                assert line.startswith(' ' * 8)
                 accumulate_lines(line[8:])
         
         elif flag == 'PARAMS':
-            if line:
-                if not line.startswith(' '):
+            if kind != _BLANK:
+                if kind <= _STANDALONE_FIELD:
                     finalize_param_desc()
                     flag = 'OVER'
                     break
                 else:
                     assert line.startswith('    ')
-                    if x := is_param_field(line):
-                        if x == 1 or x == 2:
-                            add_param(line)
-                            flag = 'PARAM_DESC'
-                        else:
-                            flag = 'EXTRA_PARAMS'
+                    if kind == _PARAM or kind == _VAR_ARGS:
+                        add_param(kind, m)
+                        flag = 'PARAM_DESC'
+                    elif kind == _VAR_KWARGS:
+                        flag = 'EXTRA_PARAMS'
                     else:
                         raise Exception(i, line)
         
         elif flag == 'STANDALONE_DESC':
-            if not line.startswith(' '):
+            if kind <= _STANDALONE_FIELD:
                 finalize_desc()
                 flag = 'DESC_DONE'
             else:
-                assert line == '' or line.startswith(' ' * 4)
+                assert line.startswith(' ' * 4)
                 accumulate_lines(line[4:])
         
         elif flag == 'TOP_DESC':
-            if is_new_field(line):
+            if kind == _PARAMS_FIELD:
                 finalize_desc()
-                if is_params_field(line):
-                    flag = 'PARAMS'
-                else:
-                    flag = 'DESC_DONE'
+                flag = 'PARAMS'
+            elif kind == _FIELD or kind == _STANDALONE_FIELD:
+                finalize_desc()
+                flag = 'DESC_DONE'
             else:
                 accumulate_lines(line)
     
@@ -1,9 +1,11 @@
 import typing as t
 from inspect import getfullargspec
+from types import MappingProxyType
 
 from .args_parser import ParamType
 from .docs_parser import T as T0
 from .. import config
+from ..streams import Stream
 
 
 class T:
@@ -13,25 +15,22 @@ class T:
     ParamName = str
     # TODO: shall we use `.args_parser.ParamType` instead?
     PlainParamType = t.Literal[
-        'any', 'bool', 'dict', 'flag', 'float', 'int',
-        'list', 'none', 'set', 'str', 'tuple',
+        'any', 'bool', 'chunks', 'dict', 'flag', 'float', 'int',
+        'lines', 'list', 'mapped', 'none', 'set', 'str', 'tuple',
     ]
     
-    ArgsTypeA = t.Dict[
-        ParamName, t.TypedDict('ArgsInfo', {
-            'cname': str,
-            'ctype': ParamType,
-            'desc' : str,
-        })
-    ]
-    ArgsTypeB = t.Dict[
-        ParamName, t.TypedDict('KwargsInfo', {
-            'cname'  : str,
-            'ctype'  : ParamType,
-            'desc'   : str,
-            'default': t.Any,
-        })
+    ContainerSpec = t.Tuple[
+        t.Literal['dict', 'list', 'set', 'tuple'],
+        t.Optional[PlainParamType],  # key type, only for dict.
+        PlainParamType,  # item type.
     ]
+    #   e.g. `dict[str, float]` -> ('dict', 'str', 'float')
+    #        `list[int]`        -> ('list', None, 'int')
+    
+    ArgsTypeA = t.Dict[ParamName, 'ParamInfo']  # `default` is not set.
+    ArgsTypeB = t.Dict[ParamName, 'ParamInfo']
+    FrontMatter = t.Mapping[str, t.Mapping[str, t.Any]]
+    #   see `./args_parser/parser.py : class T : ParamsInfo`.
     RawInfo = t.TypedDict('RawInfo', {
         'name'  : str,
         'args'  : t.Tuple[
@@ -42,6 +41,8 @@ class T:
             t.List[t.Tuple[ParamName, PlainParamType]],
         ],
         'return': PlainParamType,  # noqa
+        'containers': t.Dict[ParamName, ContainerSpec],
+        'streams': t.Dict[ParamName, PlainParamType],
     })
 
 
@@ -65,6 +66,118 @@ class T:
 #     VARIABLE_KEYWORD_ARGUMENT = auto()
 
 
+class ParamInfo:
+    """
+    a compact record of one parameter.
+    
+    fields:
+        cname: the cli name, e.g. 'aaa' for arguments, '--aaa' for options.
+        cshort: the short alias defined in docstring, e.g. '-a', or empty.
+        ctype: `ParamType`.
+        desc: the description from docstring.
+        default: the default value. not set for required positional -
+            arguments, `*args` and `**kwargs`.
+    
+    for backward compatibility it can also be accessed like a dict, where -
+    `info['cname']` gives the legacy '<cname>, <cshort>' form.
+    """
+    __slots__ = ('cname', 'cshort', 'ctype', 'desc', 'default')
+    
+    def __init__(
+        self,
+        cname: str,
+        ctype: ParamType,
+        desc: str = '',
+        cshort: str = '',
+        **kwargs
+    ) -> None:
+        self.cname = cname
+        self.cshort = cshort
+        self.ctype = ctype
+        self.desc = desc
+        if 'default' in kwargs:
+            self.default = kwargs['default']
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__ and hasattr(self, key)
+    
+    def __getitem__(self, key: str) -> t.Any:
+        if key not in self:
+            raise KeyError(key)
+        if key == 'cname' and self.cshort:
+            return '{}, {}'.format(self.cname, self.cshort)
+        return getattr(self, key)
+    
+    def __setitem__(self, key: str, value: t.Any) -> None:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        if key == 'cname' and ', ' in value:
+            self.cname, self.cshort = value.split(', ')
+        else:
+            setattr(self, key, value)
+    
+    def __repr__(self) -> str:
+        return 'ParamInfo({})'.format(
+            ', '.join('{}={!r}'.format(k, getattr(self, k)) for k in self.keys())
+        )
+    
+    def get(self, key: str, default: t.Any = None) -> t.Any:
+        return self[key] if key in self else default
+    
+    def keys(self) -> t.Tuple[str, ...]:
+        return tuple(k for k in self.__slots__ if hasattr(self, k))
+
+
+class _ArgsDict(dict):
+    """
+    `FuncInfo.args0` ~ `args4`. a dict which calls `on_change` when it is -
+    written, so that the views of `FuncInfo` built from it are dropped.
+    it is pickled as a plain dict.
+    """
+    
+    def __init__(self, data: t.Mapping, on_change: t.Callable[[], None]):
+        super().__init__(data)
+        self._on_change = on_change
+    
+    def __reduce__(self) -> tuple:
+        return dict, (dict(self),)
+    
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._on_change()
+    
+    def __ior__(self, other: t.Mapping) -> '_ArgsDict':
+        self.update(other)
+        return self
+    
+    def __setitem__(self, key: str, value: ParamInfo) -> None:
+        super().__setitem__(key, value)
+        self._on_change()
+    
+    def clear(self) -> None:
+        super().clear()
+        self._on_change()
+    
+    def pop(self, key: str, *default: t.Any) -> t.Any:
+        out = super().pop(key, *default)
+        self._on_change()
+        return out
+    
+    def popitem(self) -> t.Tuple[str, ParamInfo]:
+        out = super().popitem()
+        self._on_change()
+        return out
+    
+    def setdefault(self, key: str, default: ParamInfo = None) -> ParamInfo:
+        out = super().setdefault(key, default)
+        self._on_change()
+        return out
+    
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self._on_change()
+
+
 class FuncInfo:
     """
     about args type 0 ~ 4:
@@ -82,6 +195,10 @@ class FuncInfo:
     args3: T.ArgsTypeB
     args4: T.ArgsTypeA  # TODO: or `T.ArgsTypeB`?
     cname_2_name: t.Dict[str, str]
+    containers: t.Dict[T.ParamName, T.ContainerSpec]
+    #   element types of list/set/tuple/dict params, see `T.ContainerSpec`.
+    streams: t.Dict[T.ParamName, T.PlainParamType]
+    #   'chunks', 'lines' or 'mapped', see `../streams.py`.
     desc: str
     name: str
     target: t.Callable
@@ -95,100 +212,163 @@ class FuncInfo:
     }
     
     GLOBAL_KWARGS: T.ArgsTypeB = {  # noqa
-        ':help' : {
-            'cname'  : '--help',
-            'ctype'  : ParamType.FLAG,
-            'desc'   : 'show help message and exit',
-            'default': False,  # False means `not explicitly set by user`.
+        ':help' : ParamInfo(
+            '--help',
+            ParamType.FLAG,
+            'show help message and exit',
+            default=False,  # False means `not explicitly set by user`.
             #   for example, when user inputs in command line:
             #       `argsense xxx.py -h`  # -> True
             #       `argsense xxx.py`     # -> False
-        },
+        ),
     }
     
+    _ARGS_FIELDS = ('args0', 'args1', 'args2', 'args3', 'args4')
+    
+    # the parse plan used when no function is specified (i.e. group mode).
+    GLOBAL_FRONT_MATTER: T.FrontMatter = MappingProxyType({
+        'args'  : MappingProxyType({}),
+        'kwargs': MappingProxyType(
+            {k: v.ctype for k, v in GLOBAL_KWARGS.items()}
+        ),
+        'index' : MappingProxyType(GLOBAL_CNAME_2_NAME),
+        'containers': MappingProxyType({}),
+        'streams': MappingProxyType({}),
+    })
+    
     def __init__(self, info: T.RawInfo) -> None:
         # print(info, ':lv')
         from ..converter import name_2_cname
         from ..converter import type_2_ctype
         
+        self._invalidate()
         self.name = info['name']
         # self.cname = name_2_cname(self.name, style='cmd')
         self.desc = ''
         # self.return_type = info['return']
         self.cname_2_name = FuncInfo.GLOBAL_CNAME_2_NAME.copy()
+        self.containers = info.get('containers', {})
+        self.streams = info.get('streams', {})
         self.transfer_help = False
         
         self.args0 = {}
         for name, type in info['args'][0]:
             self._register_cname(name_2_cname(name, style='arg'), name)
             self._register_cname(name_2_cname(name, style='opt'), name)
-            self.args0[name] = {
-                'cname': name_2_cname(name, style='arg'),
-                'ctype': type_2_ctype(type),
-                'desc' : '',
-            }
+            self.args0[name] = ParamInfo(
+                name_2_cname(name, style='arg'), type_2_ctype(type)
+            )
         
         self.args1 = {}
         for name, type, default in info['args'][1]:
             self._register_cname(name_2_cname(name, style='opt'), name)
-            self.args1[name] = {
-                'cname'  : name_2_cname(name, style='opt'),
-                'ctype'  : type_2_ctype(type),
-                'desc'   : '',
-                'default': default,
-            }
+            self.args1[name] = ParamInfo(
+                name_2_cname(name, style='opt'), type_2_ctype(type),
+                default=default,
+            )
         
         self.args2 = {}
         if info['args'][2]:
             name, type = info['args'][2][0]
-            self.args2['*'] = {
-                'cname': name_2_cname(name, style='arg'),
-                'ctype': type_2_ctype(type),
-                'desc' : '',
-            }
+            self.args2['*'] = ParamInfo(
+                name_2_cname(name, style='arg'), type_2_ctype(type)
+            )
         
         self.args3 = {}
         for name, type, default in info['args'][3]:
             self._register_cname(name_2_cname(name, style='opt'), name)
-            self.args3[name] = {
-                'cname'  : name_2_cname(name, style='opt'),
-                'ctype'  : type_2_ctype(type),
-                'desc'   : '',
-                'default': default,
-            }
+            self.args3[name] = ParamInfo(
+                name_2_cname(name, style='opt'), type_2_ctype(type),
+                default=default,
+            )
         
         self.args4 = {}
         if info['args'][4]:
             name, type = info['args'][4][0]
-            self.args4['**'] = {
-                'cname': name_2_cname(name, style='arg'),
-                'ctype': type_2_ctype(type),
-                'desc' : '',
-            }
+            self.args4['**'] = ParamInfo(
+                name_2_cname(name, style='arg'), type_2_ctype(type)
+            )
+    
+    def __getstate__(self) -> dict:
+        # `target` is bound at runtime, it is excluded from pickling (see -
+        # `../cache.py`).
+        state = self.__dict__.copy()
+        state.pop('target', None)
+        state.pop('_front_matter')
+        state.pop('_views')
+        return state
+    
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        for key in FuncInfo._ARGS_FIELDS:
+            setattr(self, key, state[key])  # wrap it again, see `__setattr__`.
+        self._invalidate()
+    
+    def __setattr__(self, key: str, value: t.Any) -> None:
+        if key in FuncInfo._ARGS_FIELDS:
+            value = _ArgsDict(value, self._invalidate)
+            super().__setattr__(key, value)
+            self._invalidate()
+        else:
+            super().__setattr__(key, value)
+    
+    # merged views of `args0` ~ `args4`. they are built on first access and -
+    # cached until `args0` ~ `args4` are reassigned or changed in place -
+    # (they are `_ArgsDict`, which drops the views on write). the views are -
+    # read-only, but their values (the `ParamInfo` records) are shared with -
+    # `args0` ~ `args4`, so that writing `self.args[name].desc = ...` takes -
+    # effect on the underlying data.
     
     @property
     def args(self) -> T.ArgsTypeA:
-        return {
-            **self.args0,
-            **self.args2,
-        }
+        if 'args' not in self._views:
+            self._views['args'] = MappingProxyType({
+                **self.args0,
+                **self.args2,
+            })
+        return self._views['args']
     
     @property
     def kwargs(self) -> T.ArgsTypeB:
-        return {
-            **self.args1,
-            **self.args3,
-            **self.args4,
-        }
+        if 'kwargs' not in self._views:
+            self._views['kwargs'] = MappingProxyType({
+                **self.args1,
+                **self.args3,
+                **self.args4,
+            })
+        return self._views['kwargs']
     
     @property
     def extended_kwargs(self) -> T.ArgsTypeB:
-        return {
-            **self.args1,
-            **self.args3,
-            **self.args4,
-            **FuncInfo.GLOBAL_KWARGS
-        }
+        if 'extended_kwargs' not in self._views:
+            self._views['extended_kwargs'] = MappingProxyType({
+                **self.args1,
+                **self.args3,
+                **self.args4,
+                **FuncInfo.GLOBAL_KWARGS
+            })
+        return self._views['extended_kwargs']
+    
+    @property
+    def front_matter(self) -> T.FrontMatter:
+        """
+        the parse plan for `parse_argv`. it is built on first access and -
+        reused by every parse, until `fill_docs_info` or `_register_cname` -
+        changes the underlying data (see also `_invalidate`).
+        """
+        if self._front_matter is None:
+            self._front_matter = MappingProxyType({
+                'args'  : MappingProxyType(
+                    {k: v.ctype for k, v in self.args.items()}
+                ),
+                'kwargs': MappingProxyType(
+                    {k: v.ctype for k, v in self.extended_kwargs.items()}
+                ),
+                'index' : MappingProxyType(self.cname_2_name.copy()),
+                'containers': MappingProxyType(self.containers),
+                'streams': MappingProxyType(self.streams),
+            })
+        return self._front_matter
     
     @property
     def has_var_args(self) -> bool:
@@ -200,48 +380,41 @@ class FuncInfo:
     
     def fill_docs_info(self, info: T.DocsInfo) -> None:
         self.desc = info['desc']
-        
-        # FIXME: do not use '<cname>, <cshort>' format. we need a better way.
+        self._front_matter = None
         
         for name, value in info['args'].items():
-            # assert self.args[name]['cname'] == value['cname']
-            self.args[name]['desc'] = value['desc']
+            # assert self.args[name].cname == value['cname']
+            self.args[name].desc = value['desc']
             if value['cshort']:
                 self._register_cname(value['cshort'], name)
-                self.args[name]['cname'] = '{}, {}'.format(
-                    value['cname'], value['cshort']
-                )
+                self.args[name].cshort = value['cshort']
             
         for name, value in info['kwargs'].items():
             if name in self.kwargs:
-                # assert self.kwargs[name]['cname'] == value['cname']
-                self.kwargs[name]['desc'] = value['desc']
+                # assert self.kwargs[name].cname == value['cname']
+                self.kwargs[name].desc = value['desc']
                 if value['cshort']:
                     self._register_cname(value['cshort'], name)
-                    self.kwargs[name]['cname'] = '{}, {}'.format(
-                        value['cname'], value['cshort']
-                    )
+                    self.kwargs[name].cshort = value['cshort']
             else:
                 assert self.args4
                 self._register_cname(value['cname'], name)
                 if value['cshort']:
                     self._register_cname(value['cshort'], name)
-                    self.args3[name] = {
-                        'cname'  : '{}, {}'
-                        .format(value['cname'], value['cshort']),
-                        'ctype'  : ParamType.ANY,
-                        'desc'   : value['desc'],
-                        'default': ...,
-                    }
-                else:
-                    self.args3[name] = {
-                        'cname'  : value['cname'],
-                        'ctype'  : ParamType.ANY,
-                        'desc'   : value['desc'],
-                        'default': ...,
-                    }
+                self.args3[name] = ParamInfo(
+                    value['cname'],
+                    ParamType.ANY,
+                    value['desc'],
+                    value['cshort'],
+                    default=...,
+                )
+    
+    def _invalidate(self) -> None:
+        self._front_matter = None
+        self._views = {}
     
     def _register_cname(self, cname: str, for_name: str) -> None:
+        self._front_matter = None
         if cname in self.cname_2_name:
             if (
                 cname == '-h' and
@@ -342,10 +515,20 @@ def parse_function(
     
     return_ = annotations.get_return_type()
     
+    containers = {}
+    streams = {}
+    for x in (*args0, *args1, *args3):
+        if x[1] in ('dict', 'list', 'set', 'tuple'):
+            containers[x[0]] = annotations.get_container_spec(x[0], x[1])
+        elif x[1] in ('chunks', 'lines', 'mapped'):
+            streams[x[0]] = x[1]
+    
     return FuncInfo({
         'name'  : func.__name__,
         'args'  : (args0, args1, args2, args3, args4),
         'return': return_,
+        'containers': containers,
+        'streams': streams,
     })
 
 
@@ -362,11 +545,14 @@ class Annotations:
             'any'    : 'any',
             'anystr' : 'str',
             'bool'   : 'flag',
+            'chunks' : 'chunks',
             'dict'   : 'dict',
             'float'  : 'float',
             'int'    : 'int',
+            'lines'  : 'lines',
             'list'   : 'list',
             'literal': 'str',
+            'mapped' : 'mapped',
             'none'   : 'none',
             'set'    : 'set',
             'str'    : 'str',
@@ -383,6 +569,8 @@ class Annotations:
             out = type_
         elif isinstance(type_, t._TypedDictMeta):
             return 'dict'
+        elif isinstance(type_, type) and issubclass(type_, Stream):
+            return type_.kind
         elif (
             (x := getattr(type_, '__base__', None)) and
             str(x) == "<class 'tuple'>"
@@ -435,6 +623,34 @@ class Annotations:
         # noinspection PyTypeChecker
         return out
     
+    def get_container_spec(
+        self, name: str, kind: T.PlainParamType
+    ) -> T.ContainerSpec:
+        """
+        get element types from annotation, e.g. `list[int]`, -
+        `t.Dict[str, float]` or `'set[str]'`. unknown element types fall -
+        back to 'any'.
+        """
+        type_ = self.annotations.get(name)
+        if isinstance(type_, str):
+            args = _split_type_args(type_)
+        else:
+            while getattr(type_, '__origin__', None) is t.Union:
+                type_ = type_.__args__[0]  # e.g. `t.Optional[list[int]]`
+            args = getattr(type_, '__args__', None) or ()
+        if kind == 'tuple' and len(args) == 2 and args[1] in (..., '...'):
+            args = args[:1]  # e.g. `tuple[int, ...]`
+        elif kind == 'tuple' and len(set(args)) > 1:
+            args = ()  # heterogeneous, e.g. `tuple[int, str]`
+        items = [
+            'any' if isinstance(x, t.TypeVar) else self._normalize_type(x)
+            for x in args
+        ]
+        if kind == 'dict':
+            key, item = (items + ['any', 'any'])[:2]
+            return 'dict', key, item
+        return kind, None, items[0] if items else 'any'  # noqa
+    
     def get_return_type(self) -> T.PlainParamType:
         if 'return' in self.annotations:
             return self._normalize_type(self.annotations['return'])
@@ -453,5 +669,26 @@ class Annotations:
             str  : 'str',
             tuple: 'tuple',
         }
+        if isinstance(default, Stream):
+            return default.kind
         # noinspection PyTypeChecker
         return dict_.get(type(default), 'any')
+
+
+def _split_type_args(annotation: str) -> t.List[str]:
+    """
+    e.g. 'dict[str, list[int]]' -> ['str', 'list[int]']
+    """
+    if not annotation.endswith(']') or '[' not in annotation:
+        return []
+    out, depth, start = [], 0, annotation.index('[') + 1
+    for i in range(start, len(annotation) - 1):
+        if annotation[i] == '[':
+            depth += 1
+        elif annotation[i] == ']':
+            depth -= 1
+        elif annotation[i] == ',' and depth == 0:
+            out.append(annotation[start:i].strip())
+            start = i + 1
+    out.append(annotation[start:-1].strip())
+    return out
@@ -0,0 +1,80 @@
+"""
+hot reload for func-loop mode.
+
+when the source file of the looping command is changed, its module is -
+re-executed in place (the same globals dict), so that modules it imported -
+stay warm in `sys.modules` and only the module itself pays for running -
+again. the commands it defines are re-registered lazily, only the looping -
+command's func info is rebuilt right away.
+
+see also `config.FUNC_LOOP_HOT_RELOAD`.
+"""
+import os
+import sys
+import typing as t
+
+if t.TYPE_CHECKING:
+    from .cli import CommandLineInterface
+
+
+def get_mtime(func: t.Callable) -> t.Optional[int]:
+    try:
+        return os.stat(func.__code__.co_filename).st_mtime_ns
+    except (AttributeError, OSError):  # builtin, or '<string>' source.
+        return None
+
+
+def reload_func(cli: 'CommandLineInterface', func: t.Callable) -> t.Callable:
+    """
+    re-execute the module where `func` is defined, and return the new -
+    function of the same name, which is registered in `cli` with the same -
+    command name.
+    if the new source fails to run, the error propagates and the old function -
+    is kept for `func`'s command.
+    """
+    namespace = func.__globals__
+    name = namespace.get('__name__')
+    module = sys.modules.get(name)
+    
+    entry = cli._registry.get(id(func))  # (func, cmd_name, transfer_help)
+    
+    from . import cache
+    cache.forget(func.__code__.co_filename)
+    
+    lazy, cli.lazy = cli.lazy, True
+    cli._reloading = True
+    try:
+        if (
+            module is not None and
+            module.__dict__ is namespace and
+            name != '__main__'
+        ):
+            import importlib
+            importlib.reload(module)
+        else:
+            # for `__main__` (the script launched by user) or a namespace -
+            # made by `argsense <target>`, execute the source in a different -
+            # `__name__`, so that `if __name__ == '__main__': cli.run()` is -
+            # not triggered again.
+            filename = func.__code__.co_filename
+            with open(filename, 'r', encoding='utf-8') as f:
+                code = compile(f.read(), filename, 'exec')
+            namespace['__name__'] = '__argsense_reload__'
+            try:
+                exec(code, namespace)
+            finally:
+                namespace['__name__'] = name
+    finally:
+        cli.lazy = lazy
+        cli._reloading = False
+    
+    new_func = namespace.get(func.__name__)
+    if not callable(new_func) or new_func is func:
+        return func
+    if entry and cli._cname_2_func.get(entry[1]) is not new_func:
+        # not registered by decorator, e.g. a tool with its own `cli` -
+        # instance, which is recreated by the reload.
+        cli.add_cmd(new_func, entry[1], entry[2])
+    if id(new_func) in cli._registry:
+        cli.get_func_info(new_func)
+    return new_func
@@ -1,2 +1,5 @@
+from ..console import setup as _setup
+_setup()
+
 from .rich import render_function_parameters
 from .rich import render_functions
@@ -4,6 +4,7 @@ from sys import platform
 
 from ...parser.args_parser import ParamType
 from ...parser.func_parser import FuncInfo
+from ...parser.func_parser import ParamInfo
 from ...parser.func_parser import T as T0
 
 try:
@@ -109,41 +110,45 @@ def _build_kwargs_panel(kwargs_info: T.KwArgsInfo) -> T.Layout:
     return layout
 
 
-def _get_arg_entry(name: T.ParamName, info: dict) -> t.Iterable[psg.Element]:
-    name = name + ' ({})'.format(info['ctype'].name)
+def _get_arg_entry(
+    name: T.ParamName, info: ParamInfo
+) -> t.Iterable[psg.Element]:
+    name = name + ' ({})'.format(info.ctype.name)
     
-    assert info['ctype'] not in (ParamType.DICT, ParamType.LIST), \
+    assert info.ctype not in (ParamType.DICT, ParamType.LIST), \
         ('unsupported type', info)
-    assert info['ctype'] not in (ParamType.FLAG, ParamType.NONE), \
+    assert info.ctype not in (ParamType.FLAG, ParamType.NONE), \
         ('unexpected type', info)
     
-    if info['ctype'] == ParamType.FLAG:
+    if info.ctype == ParamType.FLAG:
         yield psg.Checkbox(name)
-        if info['desc']:
-            yield psg.Text(info['desc'], text_color='grey')
+        if info.desc:
+            yield psg.Text(info.desc, text_color='grey')
     
     else:
         yield psg.Text(name)
-        if info['desc']:
-            yield psg.Text(info['desc'], text_color='grey')
+        if info.desc:
+            yield psg.Text(info.desc, text_color='grey')
         yield psg.InputText()
 
 
-def _get_kwarg_entry(name: T.ParamName, info: dict) -> t.Iterable[psg.Element]:
-    name = name + ' ({})'.format(info['ctype'].name)
+def _get_kwarg_entry(
+    name: T.ParamName, info: ParamInfo
+) -> t.Iterable[psg.Element]:
+    name = name + ' ({})'.format(info.ctype.name)
     
-    assert info['ctype'] not in (ParamType.DICT, ParamType.LIST), \
+    assert info.ctype not in (ParamType.DICT, ParamType.LIST), \
         ('unsupported type', info)
-    assert info['ctype'] not in (ParamType.FLAG, ParamType.NONE), \
+    assert info.ctype not in (ParamType.FLAG, ParamType.NONE), \
         ('unexpected type', info)
     
-    if info['ctype'] == ParamType.FLAG:
-        yield psg.Checkbox(name, default=bool(info['default']))
-        if info['desc']:
-            yield psg.Text(info['desc'], text_color='grey')
+    if info.ctype == ParamType.FLAG:
+        yield psg.Checkbox(name, default=bool(info.default))
+        if info.desc:
+            yield psg.Text(info.desc, text_color='grey')
     
     else:
         yield psg.Text(name)
-        if info['desc']:
-            yield psg.Text(info['desc'], text_color='grey')
-        yield psg.InputText(default_text=str(info['default']))
+        if info.desc:
+            yield psg.Text(info.desc, text_color='grey')
+        yield psg.InputText(default_text=str(info.default))
@@ -124,25 +124,19 @@ def render_function_parameters(
     i = 0
     for key, arg in func_info.args0.items():
         i += 1
-        name, short = (
-            arg['cname'].split(', ') if ', ' in arg['cname']
-            else (arg['cname'], '')
-        )
+        name, short = arg.cname, arg.cshort
         # name = pretty_cname(name)
         table.add_row(
             '*',
             '{:<4}'.format(i),
             name,
             short + '   ',
-            arg['ctype'].name + '   ',
-            arg['desc'],
+            arg.ctype.name + '   ',
+            arg.desc,
         )
     for key, arg in func_info.args1.items():
         i += 1
-        name, short = (
-            arg['cname'].split(', ') if ', ' in arg['cname']
-            else (arg['cname'], '')
-        )
+        name, short = arg.cname, arg.cshort
         name = name.lstrip('-')  # FIXME: is this good?
         # name = pretty_cname(name)
         table.add_row(
@@ -150,49 +144,46 @@ def render_function_parameters(
             '{:<4}'.format(i),
             name,
             short + '   ',
-            arg['ctype'].name + '   ',
-            arg['desc'],
-            '   ' + 'default = {}'.format(val_2_cval(arg['default'])),
+            arg.ctype.name + '   ',
+            arg.desc,
+            '   ' + 'default = {}'.format(val_2_cval(arg.default)),
         )
     if func_info.args2:
         table.add_row(
             ' ',
             '*',
-            func_info.args2['*']['cname'],
-            # pretty_cname(func_info.args2['*']['cname']),
+            func_info.args2['*'].cname,
+            # pretty_cname(func_info.args2['*'].cname),
             '',
-            func_info.args2['*']['ctype'].name + '   ',
+            func_info.args2['*'].ctype.name + '   ',
             # '[dim](allow passing variable arguments...)[/]',
         )
     for key, arg in func_info.args3.items():
         i += 1
-        name, short = (
-            arg['cname'].split(', ') if ', ' in arg['cname']
-            else (arg['cname'], '')
-        )
+        name, short = arg.cname, arg.cshort
         name = name.lstrip('-')  # FIXME: is this good?
         # name = pretty_cname(name)
-        is_var_kwargs = arg['default'] is ...  # WORKAROUND
-        is_required = arg['default'] == ':required'  # WORKAROUND
+        is_var_kwargs = arg.default is ...  # WORKAROUND
+        is_required = arg.default == ':required'  # WORKAROUND
         table.add_row(
             '*' if is_required else ' ',
             '-   ' if has_var_args or is_var_kwargs else '{:<4}'.format(i),
             name,
             short + '   ',
-            arg['ctype'].name + '   ',
-            arg['desc'],
+            arg.ctype.name + '   ',
+            arg.desc,
             '' if is_required else
-            '   ' + 'default = {}'.format(val_2_cval(arg['default'])),
+            '   ' + 'default = {}'.format(val_2_cval(arg.default)),
         )
     if func_info.args4:
         if not config.HIDE_UNSTATED_VARIABLE_KWARGS:
             table.add_row(
                 ' ',
                 '-   ',
-                # func_info.args4['**']['cname'],
+                # func_info.args4['**'].cname,
                 '...',
                 '',
-                func_info.args4['**']['ctype'].name + '   ',
+                func_info.args4['**'].ctype.name + '   ',
                 '[dim](this function may accept more keyword arguments as '
                 'implicit vars...)[/]',
             )
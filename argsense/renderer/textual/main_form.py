@@ -69,32 +69,32 @@ class MainForm(Widget):
                 limit=20
             ) + 1
             
-            for key, dict_ in self._func_info.args.items():
+            for key, info in self._func_info.args.items():
                 if key.startswith('*'):
                     continue
                 has_child = True
                 with MainRow(
-                        label=dict_['cname'],
+                        label=info.cname,
                         param_name=key,
                         param_type='arg',
                         value_default='',
-                        value_type=dict_['ctype'],
-                        help=dict_['desc'],
+                        value_type=info.ctype,
+                        help=info.desc,
                         label_width=label_width,
                 ) as row:
                     row.styles.height = 3
             
-            for key, dict_ in self._func_info.kwargs.items():
+            for key, info in self._func_info.kwargs.items():
                 if key.startswith('*'):
                     continue
                 has_child = True
                 with MainRow(
-                        label=dict_['cname'].lstrip('-'),
+                        label=info.cname.lstrip('-'),
                         param_name=key,
                         param_type='opt',
-                        value_default=dict_['default'],
-                        value_type=dict_['ctype'],
-                        help=dict_['desc'],
+                        value_default=info.default,
+                        value_type=info.ctype,
+                        help=info.desc,
                         label_width=label_width,
                 ) as row:
                     row.styles.height = 3
@@ -0,0 +1,139 @@
+"""
+stream params, for large inputs read at constant memory.
+
+annotate a param with one of the stream types, its command line value is a -
+file path, or '-' for stdin:
+    
+    from argsense import Lines, cli
+    
+    @cli
+    def count(src: Lines = Lines()):  # the default `Lines()` is stdin.
+        n = 0
+        for _ in src:
+            n += 1
+        print(n)
+    
+    # cat big.log | python count.py
+    # python count.py big.log
+
+the file is not opened when parsing argv, but when the command starts -
+iterating (or entering, for `Mapped`) the stream, and it is closed when the -
+iteration ends.
+"""
+import os
+import stat
+import sys
+import typing as t
+
+
+class T:
+    Kind = t.Literal['chunks', 'lines', 'mapped']
+
+
+class Stream:
+    kind: T.Kind
+    
+    def __init__(self, path: str = '-') -> None:
+        """
+        params:
+            path: a file path, '-' means stdin.
+        """
+        self.path = path
+    
+    @property
+    def is_stdin(self) -> bool:
+        return self.path == '-'
+    
+    def __repr__(self) -> str:
+        return '<{} {!r}>'.format(type(self).__name__, self.path)
+
+
+class Lines(Stream):
+    """ an iterator of text lines, with line endings stripped. """
+    kind = 'lines'
+    
+    def __init__(self, path: str = '-', encoding: str = 'utf-8') -> None:
+        super().__init__(path)
+        self.encoding = encoding
+    
+    def __iter__(self) -> t.Iterator[str]:
+        if self.is_stdin:
+            for line in sys.stdin:
+                yield line.rstrip('\r\n')
+        else:
+            with open(self.path, 'r', encoding=self.encoding) as f:
+                for line in f:
+                    yield line.rstrip('\r\n')
+
+
+class Chunks(Stream):
+    """ an iterator of binary chunks, each is `size` bytes except the last. """
+    kind = 'chunks'
+    
+    def __init__(self, path: str = '-', size: int = 1 << 16) -> None:
+        super().__init__(path)
+        self.size = size
+    
+    def __iter__(self) -> t.Iterator[bytes]:
+        if self.is_stdin:
+            yield from iter(lambda: sys.stdin.buffer.read(self.size), b'')
+        else:
+            with open(self.path, 'rb') as f:
+                yield from iter(lambda: f.read(self.size), b'')
+
+
+class Mapped(Stream):
+    """
+    a read-only memoryview over the memory-mapped file. use it as a context -
+    manager:
+        with src as view:
+            print(view[:4].tobytes())
+    stdin can be mapped if it is redirected from a regular file (`< file`), -
+    otherwise (e.g. a pipe) it is read into memory as a whole.
+    """
+    kind = 'mapped'
+    
+    def __init__(self, path: str = '-') -> None:
+        super().__init__(path)
+        self._resources = []
+    
+    def __enter__(self) -> memoryview:
+        import mmap
+        if self.is_stdin:
+            f = sys.stdin.buffer
+        else:
+            f = open(self.path, 'rb')
+            self._resources.append(f)
+        try:
+            st = os.fstat(f.fileno())
+        except (AttributeError, OSError):  # e.g. a replaced `sys.stdin`.
+            regular = False
+        else:
+            regular = stat.S_ISREG(st.st_mode) and st.st_size > 0
+        if regular:  # an empty file can not be mapped.
+            m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._resources.append(m)
+            view = memoryview(m)
+        else:
+            view = memoryview(f.read())
+        self._resources.append(view)
+        return view
+    
+    def __exit__(self, *_) -> None:
+        while self._resources:  # view, mmap, then file.
+            x = self._resources.pop()
+            if isinstance(x, memoryview):
+                x.release()
+                continue
+            try:
+                x.close()
+            except BufferError:  # slices of the view are still alive.
+                pass  # the mmap is closed when they are collected.
+
+
+def open_stream(path: str, kind: T.Kind) -> Stream:
+    """
+    raises AssertionError if path is neither '-' nor an existing file.
+    """
+    assert path == '-' or os.path.isfile(path), ('file not found', path)
+    return {'chunks': Chunks, 'lines': Lines, 'mapped': Mapped}[kind](path)
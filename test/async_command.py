@@ -0,0 +1,34 @@
+import asyncio
+
+from argsense import cli
+
+
+@cli
+async def fetch(url: str, delay: float = 0.1) -> str:
+    """
+    params:
+        url:
+        delay (-d): simulate network latency.
+    """
+    await asyncio.sleep(delay)
+    print('fetched', url, 'in loop', id(asyncio.get_running_loop()))
+    return url
+
+
+@cli
+async def fetch_many(*urls: str) -> None:
+    results = await asyncio.gather(*(fetch(x, 0.1) for x in urls))
+    print(results)
+
+
+@cli
+def sync_one(name: str) -> None:
+    print('hello', name)
+
+
+if __name__ == '__main__':
+    # pox test/async_command.py fetch example.com
+    # pox test/async_command.py fetch-many a.com b.com c.com
+    # pox test/async_command.py fetch example.com :loop
+    #   the loop id stays the same across iterations.
+    cli.run()
@@ -0,0 +1,42 @@
+import time
+
+from argsense import cli
+
+
+@cli
+def hello(name: str = 'world', times: int = 1) -> str:
+    """
+    params:
+        name (-n):
+        times (-t):
+    """
+    for _ in range(times):
+        print(f'hello {name}')
+    return name.upper()
+
+
+@cli
+def divide(a: int, b: int) -> float:
+    return a / b
+
+
+@cli
+def quit_(code: int = 0) -> None:
+    raise SystemExit(code)
+
+
+@cli
+def sleep(seconds: float) -> float:
+    time.sleep(seconds)
+    print('slept', seconds)
+    return seconds
+
+
+if __name__ == '__main__':
+    # printf 'hello -n alice\ndivide 6 3\ndivide 1 0\nquit --code 2\n' | \
+    #   pox test/batch_mode.py :batch
+    # printf '-n alice\n-n bob -t 2\n# comment\n\n--wrong\n' | \
+    #   pox test/batch_mode.py hello :batch
+    # printf '0.3\n0.1\n0.2\n' | pox test/batch_mode.py sleep :parallel
+    #   records are written in the order of lines, see also `config.PARALLEL_*`.
+    cli.run()
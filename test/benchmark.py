@@ -0,0 +1,345 @@
+"""
+startup and dispatch benchmarks.
+
+usage:
+    pox test/benchmark.py -h
+    pox test/benchmark.py run
+    pox test/benchmark.py run --output bench-1.1.1.json
+    pox test/benchmark.py run --baseline bench-1.1.1.json --threshold 0.2
+    pox test/benchmark.py run --only parse_argv,render_help
+    pox test/benchmark.py run --only parse_numbers
+    pox test/benchmark.py run --only parse_list
+    pox test/benchmark.py run --only run_func
+    pox test/benchmark.py list
+
+results are written as json, every case is measured in seconds per call -
+(the best of `repeat` rounds). when a baseline file is given, the run fails -
+(exit code 1) if any case is slower than `baseline * (1 + threshold)`.
+"""
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+import typing as t
+
+import argsense
+from argsense import CommandLineInterface
+from argsense import cli
+from argsense import config
+from argsense.parser import Argv
+from argsense.parser import parse_argv
+from argsense.parser import parse_docstring
+from argsense.parser import parse_function
+
+_cases: t.Dict[str, t.Callable[[int], t.Dict[str, float]]] = {}
+
+
+def case(func: t.Callable) -> t.Callable:
+    _cases[func.__name__.rstrip('_')] = func
+    return func
+
+
+@cli
+def run(
+    output: str = '',
+    baseline: str = '',
+    threshold: float = 0.2,
+    repeat: int = 5,
+    only: str = '',
+) -> None:
+    """
+    params:
+        output (-o): save results to this json file.
+        baseline (-b): a json file generated by a previous run.
+        threshold (-t):
+            allowed slowdown ratio against baseline, for example 0.2 means -
+            20%.
+        repeat (-r): rounds of each measurement, the best one is taken.
+        only: comma separated case names, see `list` command.
+    """
+    config.USE_CACHE = False  # measure the real introspection cost.
+    
+    names = only.split(',') if only else tuple(_cases)
+    results = {}
+    for name in names:
+        results.update(_cases[name](repeat))
+    
+    data = {
+        'meta'   : {
+            'argsense': argsense.__version__,
+            'python'  : platform.python_version(),
+            'platform': platform.platform(),
+            'time'    : time.strftime('%Y-%m-%d %H:%M:%S'),
+        },
+        'results': results,
+    }
+    
+    old = {}
+    if baseline:
+        with open(baseline, 'r', encoding='utf-8') as f:
+            old = json.load(f)['results']
+    
+    regressions = []
+    width = max(map(len, results))
+    for name, value in results.items():
+        line = '{:<{}}  {:>12}'.format(name, width, _humanize(value))
+        if name in old:
+            ratio = value / old[name] - 1
+            line += '  {:>+8.1%}'.format(ratio)
+            if ratio > threshold:
+                line += '  REGRESSION'
+                regressions.append(name)
+        sys.stdout.write(line + '\n')  # bypass lk_logger's print.
+    
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+    
+    if regressions:
+        sys.stdout.write(
+            '{} case(s) exceeded the threshold ({:.0%}): {}\n'.format(
+                len(regressions), threshold, ', '.join(regressions)
+            )
+        )
+        sys.exit(1)
+
+
+@cli
+def list_() -> None:
+    for name, func in _cases.items():
+        print('{:<24}{}'.format(name, (func.__doc__ or '').strip()))
+
+
+# -----------------------------------------------------------------------------
+
+@case
+def import_time(repeat: int) -> t.Dict[str, float]:
+    """ `import argsense` in a fresh interpreter. """
+    best = float('inf')
+    for _ in range(repeat):
+        proc = subprocess.run(
+            (sys.executable, '-X', 'importtime', '-c', 'import argsense'),
+            capture_output=True, text=True, check=True,
+            env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)},
+        )
+        m = re.search(
+            r'^import time: +\d+ \| +(\d+) \| argsense$',
+            proc.stderr, re.M
+        )
+        best = min(best, int(m.group(1)) / 1e6)
+    return {'import_time': best}
+
+
+@case
+def add_cmd(repeat: int) -> t.Dict[str, float]:
+    """ `CommandLineInterface.add_cmd` per function, 10/100/1000 commands. """
+    out = {}
+    for lazy in (False, True):
+        for count in (10, 100, 1000):
+            funcs = _make_functions(count)
+            
+            def register() -> None:
+                subcli = CommandLineInterface(lazy=lazy)
+                for f in funcs:
+                    subcli.add_cmd(f)
+            
+            key = 'add_cmd{}_{}'.format('_lazy' if lazy else '', count)
+            out[key] = _measure(register, repeat) / count
+    return out
+
+
+@case
+def parse_docstring_(repeat: int) -> t.Dict[str, float]:
+    """ `parse_docstring` on a long multi-section docstring. """
+    func = _make_functions(1, params=50, desc_lines=40)[0]
+    func_info = parse_function(func)
+    doc = func.__doc__
+    return {
+        'parse_docstring': _measure(
+            lambda: parse_docstring(doc, func_info), repeat
+        )
+    }
+
+
+@case
+def parse_argv_(repeat: int) -> t.Dict[str, float]:
+    """ `parse_argv` with 200 options passed. """
+    func = _make_functions(1, params=200)[0]
+    func_info = parse_function(func)
+    func_info.fill_docs_info(parse_docstring(func.__doc__, func_info))
+    args = ['0']
+    for i in range(1, 200):
+        if i % 4 == 2:  # bool
+            args.append('--param-{}'.format(i))
+        else:
+            args.extend(('--param-{}'.format(i), str(i)))
+    argv = Argv(('python',), ('bench.py',), tuple(args))
+    front_matter = func_info.front_matter
+    return {
+        'parse_argv': _measure(
+            lambda: parse_argv(argv, 'command', front_matter), repeat
+        )
+    }
+
+
+@case
+def parse_numbers(repeat: int) -> t.Dict[str, float]:
+    """
+    `parse_argv` with 5000 numbers passed to `*args`, compared with the -
+    legacy `eval` based decoding.
+    """
+    from argsense import converter
+    
+    def func(*values) -> None:
+        pass
+    
+    func_info = parse_function(func)
+    forms = ('{}', '{}.5', '.{}', '0x{:x}', '0b{:b}')
+    args = tuple(forms[i % len(forms)].format(i) for i in range(5000))
+    argv = Argv(('python',), ('bench.py',), args)
+    front_matter = func_info.front_matter
+    
+    out = {
+        'parse_numbers': _measure(
+            lambda: parse_argv(argv, 'command', front_matter), repeat
+        )
+    }
+    decode_number, converter.decode_number = converter.decode_number, eval
+    try:
+        out['parse_numbers_eval'] = _measure(
+            lambda: parse_argv(argv, 'command', front_matter), repeat
+        )
+    finally:
+        converter.decode_number = decode_number
+    return out
+
+
+@case
+def parse_list(repeat: int) -> t.Dict[str, float]:
+    """
+    `parse_argv` with 10000 ids passed to a `t.List[int]` option, as one -
+    comma separated value and as repeated options.
+    """
+    def func(ids: t.List[int] = None) -> None:
+        pass
+    
+    func_info = parse_function(func)
+    front_matter = func_info.front_matter
+    ids = tuple(map(str, range(10000)))
+    argv_a = Argv(('python',), ('bench.py',), ('--ids', ','.join(ids)))
+    argv_b = Argv(
+        ('python',), ('bench.py',),
+        tuple(x for i in ids for x in ('--ids', i))
+    )
+    return {
+        'parse_list_joined': _measure(
+            lambda: parse_argv(argv_a, 'command', front_matter), repeat
+        ),
+        'parse_list_repeated': _measure(
+            lambda: parse_argv(argv_b, 'command', front_matter), repeat
+        ),
+    }
+
+
+@case
+def run_func(repeat: int) -> t.Dict[str, float]:
+    """ `argsense.run_func` on a function with 20 params, called repeatedly. """
+    func = _make_functions(1, params=20)[0]
+    return {
+        'run_func': _measure(
+            lambda: argsense.run_func(func, '1 --param-1 a --param-2'), repeat
+        )
+    }
+
+
+@case
+def render_help(repeat: int) -> t.Dict[str, float]:
+    """ `render_function_parameters` with 50 parameters. """
+    from argsense import renderer
+    from argsense.renderer.rich.render import console
+    func = _make_functions(1, params=50)[0]
+    func_info = parse_function(func)
+    func_info.fill_docs_info(parse_docstring(func.__doc__, func_info))
+    argv = Argv(('python',), ('bench.py',), ('-h',))
+    
+    def render() -> None:
+        with console.capture():
+            renderer.render_function_parameters(argv, func_info)
+    
+    return {'render_help': _measure(render, repeat)}
+
+
+# -----------------------------------------------------------------------------
+
+def _humanize(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e3), ('us', 1e6)):
+        if seconds * scale >= 1:
+            return '{:.3f} {}'.format(seconds * scale, unit)
+    return '{:.3f} ns'.format(seconds * 1e9)
+
+
+def _make_functions(
+    count: int, params: int = 6, desc_lines: int = 3
+) -> t.List[t.Callable]:
+    """
+    generate functions like:
+        def func_0(param_0: int, param_1: str = '', param_2: bool = False, -
+                   ...) -> None:
+            '''
+            <desc_lines>
+            
+            params:
+                param_0 (-a): ...
+                param_1: ...
+                ...
+            '''
+    """
+    types = (
+        ('int', '0'), ('str', "''"), ('bool', 'False'), ('float', '0.0')
+    )
+    sig = ['param_0: int']
+    doc = ['lorem ipsum dolor sit amet. ' * 3] * desc_lines
+    doc.extend(('', 'params:', '    param_0 (-a): the first param.'))
+    for i in range(1, params):
+        type_, default = types[i % len(types)]
+        sig.append('param_{}: {} = {}'.format(i, type_, default))
+        doc.append('    param_{}:'.format(i))
+        doc.append('        consectetur adipiscing elit, sed do -')
+        doc.append('        eiusmod tempor incididunt.')
+    code = '\n'.join(
+        'def func_{}({}) -> None:\n    """\n{}\n    """\n'.format(
+            n,
+            ', '.join(sig),
+            '\n'.join('    ' + x if x else '' for x in doc),
+        ) for n in range(count)
+    )
+    namespace = {}
+    exec(code, namespace)
+    return [namespace['func_{}'.format(n)] for n in range(count)]
+
+
+def _measure(func: t.Callable, repeat: int, min_time: float = 0.2) -> float:
+    """ return the best seconds per call. """
+    number = 1
+    while True:  # calibrate, like `timeit.Timer.autorange`.
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if (elapsed := time.perf_counter() - start) >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+if __name__ == '__main__':
+    # pox test/benchmark.py run -o bench.json
+    cli.run()
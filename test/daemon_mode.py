@@ -0,0 +1,28 @@
+from argsense import cli
+
+
+@cli
+def hello(name: str = 'world', times: int = 1) -> None:
+    """
+    params:
+        name (-n):
+        times (-t):
+    """
+    for _ in range(times):
+        print(f'hello {name}')
+
+
+@cli
+def fail(code: int = 3) -> None:
+    raise SystemExit(code)
+
+
+if __name__ == '__main__':
+    # pox -m argsense.daemon serve test/daemon_mode.py
+    #   then in another terminal:
+    # pox -m argsense.daemon run test/daemon_mode.py hello -n alice -t 2
+    # pox -m argsense.daemon run test/daemon_mode.py fail
+    # pox -m argsense.daemon run test/daemon_mode.py -h
+    # pox -m argsense.daemon stop test/daemon_mode.py
+    #   without a daemon, `run` falls back to executing this file in process.
+    cli.run()
@@ -0,0 +1,270 @@
+"""
+golden tests of `parse_docstring`.
+
+usage:
+    pox test/docstring_golden.py check
+    pox test/docstring_golden.py update
+
+`update` snapshots the current parsing results into -
+`test/docstring_golden.json`, `check` compares against it. only run `update` -
+when a behavior change of the docstring parser is intended.
+"""
+import json
+import os
+import sys
+import typing as t
+
+from argsense import CommandLineInterface
+from argsense.parser import parse_docstring
+from argsense.parser import parse_function
+
+cli = CommandLineInterface('docstring-golden')
+_golden_file = os.path.join(os.path.dirname(__file__), 'docstring_golden.json')
+_samples: t.List[t.Callable] = []
+
+
+def sample(func: t.Callable) -> t.Callable:
+    _samples.append(func)
+    return func
+
+
+@cli
+def check() -> None:
+    with open(_golden_file, 'r', encoding='utf-8') as f:
+        golden = json.load(f)
+    failed = 0
+    for name, result in _collect().items():
+        if golden.get(name) != result:
+            failed += 1
+            sys.stdout.write('mismatch: {}\n'.format(name))
+            sys.stdout.write('    expected: {}\n'.format(golden.get(name)))
+            sys.stdout.write('    actual  : {}\n'.format(result))
+    sys.stdout.write('{} samples, {} failed\n'.format(len(golden), failed))
+    if failed:
+        sys.exit(1)
+
+
+@cli
+def update() -> None:
+    with open(_golden_file, 'w', encoding='utf-8') as f:
+        json.dump(_collect(), f, indent=2)
+        f.write('\n')
+
+
+def _collect() -> t.Dict[str, t.Any]:
+    out = {}
+    for func in _samples:
+        try:
+            result = parse_docstring(func.__doc__, parse_function(func))
+        except Exception as e:
+            result = {'error': type(e).__name__}
+        out[func.__name__] = result
+    return out
+
+
+# -----------------------------------------------------------------------------
+
+@sample
+def oneline(aaa: int) -> None:
+    """ show something. """
+
+
+@sample
+def top_desc_only(aaa: int) -> None:
+    """
+    the first line.
+    the second line, which is long and -
+    continued here.
+    
+    the third line after a blank line.
+    """
+
+
+@sample
+def params_only(aaa: int, bbb: str = '') -> None:
+    """
+    params:
+        aaa: the first param.
+        bbb (-b): the second param.
+    """
+
+
+@sample
+def desc_and_params(aaa: int, bbb: str = '', ccc: bool = False) -> None:
+    """
+    do something with aaa, bbb and ccc.
+    
+    params:
+        aaa (-a): the first param.
+        bbb:
+            the description starts from the next line, and it is long -
+            enough to be continued.
+        ccc (-c): flag.
+            and more text on the next line.
+    """
+
+
+@sample
+def other_sections(aaa: int, bbb: int = 1) -> None:
+    """
+    do something.
+    
+    examples:
+        foo 1 --bbb 2
+    
+    args:
+        aaa: the first param.
+        bbb: the second param.
+    
+    returns:
+        nothing.
+    """
+
+
+@sample
+def standalone_desc(aaa: int) -> None:
+    """
+    argsense:
+        this is the description only for command line.
+        and the second line.
+    
+    params:
+        aaa: the params field after a standalone desc.
+    """
+
+
+@sample
+def help_field(aaa: int) -> None:
+    """
+    help:
+        description in help field.
+    """
+
+
+@sample
+def var_args(aaa: int, *bbb) -> None:
+    """
+    params:
+        aaa: the first param.
+        *bbb: the rest params.
+    """
+
+
+@sample
+def var_kwargs(aaa: int, **kwargs) -> None:
+    """
+    something about var kwargs.
+    
+    params:
+        aaa: the first param.
+        **kwargs:
+            bbb: extra option.
+            ccc (-c):
+                the description of ccc, which is long -
+                and continued.
+            ddd: the last one.
+    """
+
+
+@sample
+def var_kwargs_then_param(aaa: int, *args, bbb: str = '', **kwargs) -> None:
+    """
+    params:
+        **kwargs:
+            ccc: extra option.
+        bbb (-b): after extra options.
+        aaa: the first param.
+    """
+
+
+@sample
+def var_kwargs_then_section(**kwargs) -> None:
+    """
+    params:
+        **kwargs:
+            aaa (-a): extra option.
+    returns:
+        nothing.
+    """
+
+
+@sample
+def upper_params_field(aaa: int) -> None:
+    """
+    PARAMS:
+        aaa: upper case field name.
+    """
+
+
+@sample
+def options_field(aaa: int = 0) -> None:
+    """
+    do it.
+    options:
+        aaa:
+    """
+
+
+@sample
+def blank_between_params(aaa: int, bbb: int = 0) -> None:
+    """
+    params:
+        aaa: the first param.
+        
+        bbb: the second param after a blank line.
+    """
+
+
+@sample
+def colon_in_desc(aaa: int) -> None:
+    """
+    note: this line has a colon.
+    params:
+        aaa: value like `a: b`.
+    """
+
+
+@sample
+def unknown_param(aaa: int) -> None:
+    """
+    params:
+        zzz: not in signature.
+    """
+
+
+@sample
+def unknown_param_with_var_kwargs(aaa: int, **kwargs) -> None:
+    """
+    params:
+        zzz (-z): not in signature but accepted by **kwargs.
+    """
+
+
+@sample
+def short_with_digit(aaa: int) -> None:
+    """
+    params:
+        aaa (-a1): short name with digit.
+    """
+
+
+@sample
+def bad_indent(aaa: int) -> None:
+    """
+    params:
+        aaa: the first param.
+          bad indented text.
+    """
+
+
+@sample
+def no_doc_fields(aaa: int) -> None:
+    """
+    
+    just text.
+    """
+
+
+if __name__ == '__main__':
+    # pox test/docstring_golden.py check
+    cli.run()
@@ -13,4 +13,6 @@ if __name__ == '__main__':
     #   input: Charlie
     #   ...
     #   input: exit
+    #   edit `main` and save this file while looping, the next input runs -
+    #   the new code if `config.FUNC_LOOP_HOT_RELOAD` is enabled.
     cli.run(main)
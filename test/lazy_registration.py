@@ -0,0 +1,25 @@
+from argsense import CommandLineInterface
+
+cli = CommandLineInterface('lazy-registration', lazy=True)
+
+
+@cli
+def func1(aaa: int, bbb: str = 'hello') -> None:
+    """
+    params:
+        aaa (-a):
+        bbb (-b):
+    """
+    print(aaa, bbb)
+
+
+@cli
+def func2(ccc: bool = False) -> None:
+    print(ccc)
+
+
+if __name__ == '__main__':
+    # pox test/lazy_registration.py -h
+    # pox test/lazy_registration.py func1 123 -b world
+    #   only `func1` is parsed, `func2` stays pending.
+    cli.run()
@@ -1,4 +1,5 @@
 from argsense import cli
+from argsense import config
 
 
 @cli.cmd()
@@ -12,4 +13,5 @@ def main(x: str) -> None:
 if __name__ == '__main__':
     # pox test/pass_empty_argument.py ''
     # pox test/pass_empty_argument.py :empty
+    config.SETUP_LK_LOGGER_ON_DISPATCH = True  # for the markers in print.
     cli.run(main)
@@ -0,0 +1,23 @@
+import typing as t
+
+from argsense import cli
+from argsense import config
+
+
+@cli
+def build(
+    target: str, jobs: int = 1, defines: t.Dict[str, str] = None,
+    verbose: bool = False,
+) -> None:
+    print(target, jobs, defines, verbose)
+
+
+if __name__ == '__main__':
+    # printf '# build options\n--jobs 4 --defines "name=my app"\n' > /tmp/a.txt
+    # pox test/response_file.py build dist @/tmp/a.txt --verbose
+    #   -> dist 4 {'name': 'my app'} True
+    # printf -- '--jobs 4\n--unknown 1\n' > /tmp/b.txt
+    # pox test/response_file.py build dist @/tmp/b.txt
+    #   -> error points at "@/tmp/b.txt", and tells "/tmp/b.txt, line 2".
+    config.EXPAND_RESPONSE_FILES = True
+    cli.run()
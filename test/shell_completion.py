@@ -0,0 +1,30 @@
+from argsense import cli
+
+
+@cli
+def hello(name: str = 'world', times: int = 1, upper: bool = False) -> None:
+    """
+    params:
+        name (-n):
+        times (-t):
+        upper (-u):
+    """
+    for _ in range(times):
+        print(f'hello {name}'.upper() if upper else f'hello {name}')
+
+
+@cli
+def copy_file(src: str, dst: str, overwrite: bool = False) -> None:
+    print(f'copy {src} to {dst}', 'overwrite' if overwrite else '')
+
+
+if __name__ == '__main__':
+    # pox -m argsense.completion script test/shell_completion.py \
+    #   --shell bash --prog shell-completion > /tmp/shell-completion.bash
+    # source /tmp/shell-completion.bash
+    # alias shell-completion='python test/shell_completion.py'
+    # shell-completion <tab>       # -> copy-file hello
+    # shell-completion hello -<tab>  # -> --name -n --times -t --upper -u ...
+    # shell-completion hello --no-<tab>  # -> --no-upper
+    # shell-completion hello :<tab>  # -> special args like :help, :loop
+    cli.run()
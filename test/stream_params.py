@@ -0,0 +1,36 @@
+from argsense import Chunks
+from argsense import Lines
+from argsense import Mapped
+from argsense import cli
+
+
+@cli
+def count_lines(src: Lines = Lines(), pattern: str = '') -> None:
+    n = 0
+    for line in src:
+        if pattern in line:
+            n += 1
+    print(n)
+
+
+@cli
+def count_bytes(src: Chunks) -> None:
+    print(sum(map(len, src)))
+
+
+@cli
+def head(src: Mapped, size: int = 16) -> None:
+    with src as view:
+        print(len(view), view[:size].tobytes())
+
+
+if __name__ == '__main__':
+    # pox test/stream_params.py count-lines -h
+    # pox test/stream_params.py count-lines test/stream_params.py
+    # cat test/stream_params.py | pox test/stream_params.py count-lines
+    # cat test/stream_params.py | pox test/stream_params.py count-lines - \
+    #   --pattern cli
+    # pox test/stream_params.py count-bytes - < test/stream_params.py
+    # pox test/stream_params.py head test/stream_params.py --size 32
+    # pox test/stream_params.py head - < test/stream_params.py
+    cli.run()
@@ -0,0 +1,36 @@
+import asyncio
+import sys
+import time
+import typing as t
+
+from argsense import cli
+
+
+@cli
+def numbers(n: int = 10, delay: float = 0) -> t.Iterator[int]:
+    i = 0
+    try:
+        for i in range(n):
+            if delay:
+                time.sleep(delay)
+            yield i
+    finally:
+        print('closed at', i, file=sys.stderr)
+
+
+@cli
+async def ticks(n: int = 3, delay: float = 0.5) -> t.AsyncIterator[dict]:
+    for i in range(n):
+        await asyncio.sleep(delay)
+        yield {'tick': i, 'time': time.time()}
+
+
+if __name__ == '__main__':
+    # pox test/streaming_output.py numbers 5
+    # pox test/streaming_output.py numbers 100000000 | head -3
+    #   -> 0 1 2, then "closed at ..." in stderr, exit code 141.
+    # pox test/streaming_output.py numbers 5 --delay 1
+    #   -> a number per second.
+    # pox test/streaming_output.py ticks :ndjson
+    # pox test/streaming_output.py numbers 5 :json
+    cli.run()
@@ -0,0 +1,44 @@
+import sys
+import typing as t
+from dataclasses import dataclass
+
+from argsense import cli
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+@cli
+def stats(n: int = 3) -> t.Dict[str, t.Any]:
+    return {'n': n, 'squares': [i * i for i in range(n)], 'tags': {'a'}}
+
+
+@cli
+def points(n: int = 3) -> t.Iterator[Point]:
+    for i in range(n):
+        yield Point(i, i * 2)
+
+
+@cli
+def noisy(n: int = 3) -> t.List[int]:
+    print('working on', n)
+    print('a warning', file=sys.stderr)
+    return list(range(n))
+
+
+if __name__ == '__main__':
+    # pox test/structured_output.py stats :json
+    #   -> {"n": 3, "squares": [0, 1, 4], "tags": ["a"]}
+    # pox test/structured_output.py points 3 :json
+    #   -> [{"x": 0, "y": 0}, {"x": 1, "y": 2}, {"x": 2, "y": 4}]
+    # pox test/structured_output.py points 3 :ndjson
+    # pox test/structured_output.py points 3 :msgpack | xxd
+    # pox test/structured_output.py noisy :json 2>/dev/null | \
+    #   python -m json.tool
+    #   -> stdout parses, the prints of `noisy` go to stderr.
+    # pox test/streaming_output.py numbers 3 :json 2>/dev/null | \
+    #   python -m json.tool
+    cli.run()